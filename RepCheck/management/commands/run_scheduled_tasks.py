@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from core.tasks import update_bills_cache, fetch_daily_congress_record
 from legislation.tasks import fetch_and_process_bills_task
+from congress.tasks import sync_members_incremental
 
 class Command(BaseCommand):
     help = 'Run scheduled tasks from multiple apps'
@@ -25,5 +26,9 @@ class Command(BaseCommand):
             result = fetch_daily_congress_record.delay()
             self.stdout.write(f'Queued congress record task: {result.id}')
             
+        elif task == 'members':
+            result = sync_members_incremental.delay()
+            self.stdout.write(f'Queued incremental member sync task: {result.id}')
+            
         else:
             self.stdout.write(self.style.ERROR(f'Unknown task: {task}'))
\ No newline at end of file
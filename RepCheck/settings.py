@@ -44,6 +44,19 @@ ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "").split(",") # Get from .env, split
 
 
 CONGRESS_API_KEY=os.getenv("CONGRESS_API_KEY")
+
+# Shared token buckets (see core/rate_limit.py): `rate` requests per `period`
+# seconds, with at most `burst` spent at once.
+RATE_LIMITS = {
+    'congress': {'rate': 5000, 'period': 60 * 60, 'burst': 250},
+    'gemini_rpm': {'rate': int(os.getenv("GEMINI_RPM", 15)), 'period': 60},
+    'gemini_tpm': {'rate': int(os.getenv("GEMINI_TPM", 1_000_000)), 'period': 60},
+}
+
+# Per-day request quotas that reset at midnight in `timezone`
+DAILY_BUDGETS = {
+    'gemini': {'limit': int(os.getenv("GEMINI_RPD", 1000)), 'timezone': 'America/Los_Angeles'},
+}
 # Application definition
 
 INSTALLED_APPS = [
@@ -66,10 +79,12 @@ INSTALLED_APPS = [
     'RepCheck',
 ]
 
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        'LOCATION': REDIS_URL,
         'KEY_PREFIX': 'repcheck',
         'TIMEOUT': 60 * 60 * 12,
     }
@@ -170,6 +185,10 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / "theme/static"]
 
+# Content-addressed store for downloaded bill/record PDFs and their Gemini
+# summaries (see core/content_store.py)
+CONTENT_STORE_ROOT = Path(os.getenv("CONTENT_STORE_ROOT", BASE_DIR / "var" / "content-store"))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -200,8 +219,20 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'core.tasks.fetch_daily_congress_record',
         'schedule': crontab(hour="*/1", minute="31"),  # Every hour
     },
+    'sync-members-incremental': {
+        'task': 'congress.tasks.sync_members_incremental',
+        'schedule': crontab(hour="3", minute="5"),  # Nightly
+    },
+    'drain-deferred-bills': {
+        'task': 'legislation.tasks.drain_deferred_bills',
+        'schedule': crontab(minute="5"),  # Every hour
+    },
+    'backfill-legislation': {
+        'task': 'legislation.tasks.backfill_legislation',
+        'schedule': crontab(hour="4", minute="20"),  # Nightly
+    },
 }
-CELERY_IMPORTS = ('legislation.tasks', 'core.views')
+CELERY_IMPORTS = ('legislation.tasks', 'core.views', 'congress.tasks')
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
 CELERY_TIMEZONE = TIME_ZONE  
\ No newline at end of file
@@ -0,0 +1,13 @@
+from core.cache_keys import digest
+
+
+def test_digest_is_stable_and_ignores_case_and_spacing():
+    # A fixed value: unlike hash(), the digest must not vary per process.
+    assert digest(query="nancy pelosi") == "4b50af6c8db22801ecc56e87424de679"
+    assert digest(query="Nancy  Pelosi", sort="name") == digest(sort="name", query="nancy pelosi")
+
+
+def test_digest_changes_with_any_part():
+    base = digest(congress=118, chamber="Senate", sort="name", query="")
+    assert base != digest(congress=119, chamber="Senate", sort="name", query="")
+    assert base != digest(congress=118, chamber="Senate", sort="party", query="")
@@ -0,0 +1,20 @@
+import pytest
+from core.congress_api import BACKOFF_CAP, CongressApiError, backoff_delay, build_url
+
+
+def test_build_url_from_path():
+    assert build_url("member/L000174") == "https://api.congress.gov/v3/member/L000174"
+
+
+def test_build_url_accepts_stored_bill_urls():
+    assert build_url("api.congress.gov/v3/bill/119/hr/1") == "https://api.congress.gov/v3/bill/119/hr/1"
+
+
+def test_build_url_rejects_other_hosts():
+    with pytest.raises(CongressApiError):
+        build_url("https://example.com/v3/bill")
+
+
+def test_backoff_delay_honours_retry_after():
+    assert backoff_delay(0, "7") == 7
+    assert backoff_delay(10) <= BACKOFF_CAP
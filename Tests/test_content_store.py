@@ -0,0 +1,16 @@
+from core.content_store import ContentStore, summary_key
+
+
+def test_identical_documents_share_one_blob_and_summary(tmp_path):
+    store = ContentStore(tmp_path)
+    first = store.put_blob(b"%PDF bill text")
+    second = store.put_blob(b"%PDF bill text")
+    assert first == second
+
+    key = summary_key("gemini-2.5-flash-lite", "Summarize", {"type": "object"})
+    store.put_summary(first, key, {"summary": "A bill."})
+    assert store.get_summary(second, key) == {"summary": "A bill."}
+
+
+def test_summary_key_changes_with_prompt():
+    assert summary_key("m", "prompt v1") != summary_key("m", "prompt v2")
@@ -0,0 +1,22 @@
+from datetime import date
+
+from core.pagination import canonical_cursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_sort_key():
+    cursor = encode_cursor([date(2025, 3, 14), 1234])
+    assert decode_cursor(cursor, 2) == ["2025-03-14", 1234]
+
+
+def test_invalid_or_mismatched_cursor_starts_from_top():
+    assert decode_cursor("not a cursor!", 2) is None
+    assert decode_cursor(encode_cursor(["TX", "Cruz, Ted", 7]), 2) is None
+    assert decode_cursor(None, 2) is None
+
+
+def test_canonical_cursor_collapses_invalid_cursors():
+    cursor = encode_cursor(["2024-01-02", 7])
+    assert canonical_cursor(cursor, 2) == cursor
+    assert canonical_cursor("garbage", 2) == ""
+    assert canonical_cursor(encode_cursor([1]), 2) == ""
+    assert canonical_cursor(None, 2) == ""
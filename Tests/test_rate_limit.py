@@ -0,0 +1,16 @@
+from core.rate_limit import TokenBucket
+
+
+def test_local_bucket_spends_burst_then_asks_caller_to_wait():
+    bucket = TokenBucket("test", rate=60, period=60, burst=2)
+    assert bucket._try_acquire_local(1) == 0
+    assert bucket._try_acquire_local(1) == 0
+    wait = bucket._try_acquire_local(1)
+    assert 0 < wait <= 1
+
+
+def test_pdf_token_estimate_counts_pages_not_page_tree():
+    from core.gemini import TOKENS_PER_PDF_PAGE, TOKENS_PER_REQUEST, estimate_pdf_tokens
+
+    pdf = b"<< /Type /Pages >> << /Type /Page >> << /Type/Page >>"
+    assert estimate_pdf_tokens(pdf) == 2 * TOKENS_PER_PDF_PAGE + TOKENS_PER_REQUEST
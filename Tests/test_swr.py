@@ -0,0 +1,58 @@
+import time
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from core import swr
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    local = LocMemCache("swr-tests", {})
+    local.clear()
+    monkeypatch.setattr(swr, "cache", local)
+    monkeypatch.setattr(swr, "close_old_connections", lambda: None)
+    return local
+
+
+def test_stale_value_is_served_while_one_refresh_runs(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert swr.get_or_refresh("k", compute, fresh_for=60) == 1
+    assert swr.get_or_refresh("k", compute, fresh_for=60) == 1
+    assert len(calls) == 1
+
+    entry = cache.get("k")
+    entry.fresh_until = time.time() - 1
+    cache.set("k", entry)
+    assert swr.get_or_refresh("k", compute, fresh_for=60) == 1
+
+    deadline = time.monotonic() + 2
+    while cache.get("k").value != 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert swr.get_or_refresh("k", compute, fresh_for=60) == 2
+    assert len(calls) == 2
+
+
+def test_upstream_errors_are_cached_briefly(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        raise ConnectionError("upstream down")
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            swr.get_or_refresh("k", compute, fresh_for=60, errors=(ConnectionError,))
+    assert len(calls) == 1
+
+
+def test_early_refresh_only_near_expiry():
+    entry = swr.Entry("v", fresh_until=time.time() + 3600, cost=0.1)
+    assert swr._is_fresh(entry)
+    entry.fresh_until = time.time() - 1
+    assert not swr._is_fresh(entry)
@@ -0,0 +1,109 @@
+"""
+Batched upserts for Member and Membership rows.
+
+Each helper turns a whole batch of API records into a single
+``INSERT ... ON CONFLICT DO UPDATE`` per ``BATCH_SIZE`` rows instead of a
+``get``/``update_or_create`` round-trip per row.
+"""
+
+from datetime import datetime
+
+from .models import Congress, Member, Membership
+
+BATCH_SIZE = 1000
+HOUSE = "House of Representatives"
+
+MEMBER_UPDATE_FIELDS = ["name", "image_url", "image_attribution", "state", "last_updated"]
+MEMBERSHIP_UPDATE_FIELDS = [
+    "chamber",
+    "party",
+    "district",
+    "start_year",
+    "end_year",
+    "leadership_role",
+]
+
+
+def congress_id_map():
+    """Maps congress number to Congress primary key in one query."""
+    return dict(Congress.objects.values_list("congress_number", "id"))
+
+
+def member_from_api(member):
+    depiction = member.get("depiction") or {}
+    return Member(
+        bioguide_id=member.get("bioguideId"),
+        name=member.get("name"),
+        image_url=depiction.get("imageUrl", "No Image URL Provided"),
+        image_attribution=depiction.get("attribution", "No Attribution Provided"),
+        state=member.get("state"),
+        last_updated=datetime.now(),
+    )
+
+
+def upsert_members(members_data, batch_size=BATCH_SIZE):
+    """Inserts or updates Member rows keyed on ``bioguide_id``.
+
+    Returns the saved Member objects (with primary keys set).
+    """
+    by_bioguide = {}
+    for member in members_data:
+        if member.get("bioguideId"):
+            by_bioguide[member["bioguideId"]] = member_from_api(member)
+    return Member.objects.bulk_create(
+        by_bioguide.values(),
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["bioguide_id"],
+        update_fields=MEMBER_UPDATE_FIELDS,
+    )
+
+
+def build_memberships(member, member_data, congress_ids):
+    """Builds (unsaved) Membership objects for every term of one member.
+
+    Leadership roles are merged into the matching term, and when a member
+    holds several terms in the same congress the last one wins. Sponsorship
+    counts are not set here; see ``legislation.counts``.
+    """
+    leadership = {
+        role.get("congress"): role.get("type") for role in member_data.get("leadership", [])
+    }
+    party_history = member_data.get("partyHistory", [])
+    memberships = {}
+
+    for term in member_data.get("terms", []):
+        congress_number = term.get("congress")
+        congress_id = congress_ids.get(congress_number)
+        if congress_id is None:
+            print(f"❌ Congress {congress_number} not found in DB. Skipping term.")
+            continue
+
+        chamber = term.get("chamber")
+        start_year = term.get("startYear")
+        party = next(
+            (p["partyName"] for p in party_history if p["startYear"] <= start_year),
+            "Unknown",
+        )
+        memberships[congress_id] = Membership(
+            member=member,
+            congress_id=congress_id,
+            chamber=chamber,
+            party=party,
+            district=term.get("district") if chamber == HOUSE else None,
+            start_year=start_year,
+            end_year=term.get("endYear"),
+            leadership_role=leadership.get(congress_number),
+        )
+    return list(memberships.values())
+
+
+def upsert_memberships(memberships, batch_size=BATCH_SIZE):
+    """Inserts or updates Membership rows keyed on ``(member, congress)``."""
+    return Membership.objects.bulk_create(
+        memberships,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["member", "congress"],
+        update_fields=MEMBERSHIP_UPDATE_FIELDS,
+    )
@@ -1,26 +1,18 @@
-import requests
 import re
-import os
 from django.core.management.base import BaseCommand
 from congress.models import Congress
+from core.congress_api import CongressApiError, get_client
+from core.invalidation import notify_changed
 from datetime import datetime
-from dotenv import load_dotenv
-
-load_dotenv()  # Ensure .env variables are loaded
-
-API_KEY = os.getenv("CONGRESS_API_KEY")  # Getting API key from .env file
-BASE_URL = "https://api.congress.gov/v3"  # Base URL for the Congress.gov API
 
 
 def fetch_congress_list():
     """Fetches the list of Congresses from the API."""
-    url = f"{BASE_URL}/congress?api_key={API_KEY}"
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Error fetching data: {response.status_code}, {response.text}")
+    client = get_client()
+    try:
+        return {"congresses": list(client.paginate("congress", "congresses"))}
+    except CongressApiError as e:
+        print(f"Error fetching data: {e}")
         return None
 
 
@@ -74,6 +66,7 @@ class Command(BaseCommand):
         data = fetch_congress_list()
         if data:
             save_congresses(data)
+            notify_changed(congresses=Congress.objects.values_list("id", flat=True))
             self.stdout.write(self.style.SUCCESS("Congress data successfully updated!"))
         else:
             self.stderr.write(self.style.ERROR("Failed to fetch Congress data."))
@@ -2,6 +2,7 @@ import yaml
 from django.core.management.base import BaseCommand
 import os
 from congress.models import Member, MemberDetails
+from core.invalidation import notify_changed
 
 
 class Command(BaseCommand):
@@ -78,6 +79,7 @@ class Command(BaseCommand):
                         "wikipedia": wikipedia,
                     },
                 )
+                notify_changed(members=[member.pk])
                 if created:
                     self.stdout.write(f"Created details for {member.name}")
                 else:
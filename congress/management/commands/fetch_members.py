@@ -1,302 +1,280 @@
-import requests
-import os
-from datetime import datetime
+import asyncio
+from datetime import timezone
 from django.core.management.base import BaseCommand
-from congress.models import Congress, Member, Membership
-from dotenv import load_dotenv
+from django.utils import timezone as django_timezone
+from django.utils.dateparse import parse_datetime
+from django.db import transaction
+from congress.bulk import (
+    BATCH_SIZE,
+    build_memberships,
+    congress_id_map,
+    upsert_members,
+    upsert_memberships,
+)
+from congress.models import Member, RosterEntry
+from congress.member_sync import sync_members
+from congress.roster import refresh_roster
+from core.congress_api import PAGE_LIMIT, CongressApiError, get_client
+from core.models import IngestionCheckpoint, SyncWatermark
+from core.invalidation import notify_changed
+from legislation.counts import refresh_sponsorship_counts
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from collections import defaultdict
-import time
 
-load_dotenv()
-
-API_KEY = os.getenv("CONGRESS_API_KEY")
-BASE_URL = "https://api.congress.gov/v3"
 MAX_THREADS = 10  # Adjust based on available resources
-REQUESTS_PER_HOUR = 5000
-SECONDS_BETWEEN_REQUESTS = 3600 / REQUESTS_PER_HOUR
+WRITE_BATCH_SIZE = 100
+WATERMARK_RESOURCE = "members"
+JOB_NAME = "fetch_members"
+API_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 
 
 class Command(BaseCommand):
     help = "Fetches members of Congress and saves them to the database."
 
-    def handle(self, *args, **kwargs):
-        self.stdout.write("Fetching members from Congress.gov API...")
-        members_data = fetch_members()
-
-        if members_data:
-            save_members(members_data)
-        else:
-            self.stdout.write(self.style.ERROR("No data received."))
-
-
-def throttled_get(url):
-    while True:
-        response = requests.get(url)
-
-        remaining = response.headers.get("x-ratelimit-remaining")
-        retry_after = response.headers.get("retry-after")
-
-        # Handle rate limiting
-        if int(remaining) % 1000 == 0:
-            print(f"📊 Remaining requests: {remaining or 'unknown'}")
-        if remaining == "0":
-            wait_time = int(retry_after or 60)
-            print(f"🚦 Rate limit hit. Waiting {wait_time} seconds...")
-            time.sleep(wait_time)
-            continue
-
-        # # For debugging/logging
-        # remaining_num = int(remaining) if remaining else None
-        # if remaining_num % 500 == 0:
-        #     print(f"📊 Remaining requests: {remaining or 'unknown'}")
-
-        # # Throttle between requests (proactive spacing)
-        # time.sleep(SECONDS_BETWEEN_REQUESTS)
-        return response
-
-
-def fetch_members():
-    members = []
-    offset = 0
-
-    while True:
-        url = f"{BASE_URL}/member?api_key={API_KEY}&offset={offset}&limit=250"
-        response = throttled_get(url)
-
-        if response.status_code != 200:
-            print(f"❌ Error fetching data: {response.status_code}")
-            break
-
-        data = response.json()
-        pagination_info = data.get("pagination", {})
-        next_page = pagination_info.get("next", None)
-
-        if "members" in data:
-            members.extend(data["members"])
-            print(f"Fetched {len(members)} members from page {offset//20 + 1}.")
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=0,
+            help="Fetch member details with the asyncio engine, N members at a time",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only sync members updated since the last successful sync",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue the last unfinished run from its checkpoint",
+        )
 
+    def handle(self, *args, **options):
+        checkpoint = IngestionCheckpoint.resumable(JOB_NAME) if options["resume"] else None
+
+        if checkpoint:
+            params = checkpoint.params
+            since = parse_datetime(params["since"]) if params.get("since") else None
+            until = parse_datetime(params["until"])
+            refresh = params.get("refresh", bool(since))
+            self.stdout.write(
+                f"Resuming run from {checkpoint.started_at:%Y-%m-%d %H:%M} at offset "
+                f"{checkpoint.next_offset(PAGE_LIMIT)} "
+                f"({len(checkpoint.processed_ids)} members already processed)"
+            )
+            checkpoint.mark_running()
         else:
-            print("❌ No members found in response.")
-            break
+            until = django_timezone.now()
+            since = (
+                SyncWatermark.get_for(WATERMARK_RESOURCE) if options["incremental"] else None
+            )
+            # Incremental runs refresh every listed member; without a watermark
+            # yet that is the full list, which establishes the first watermark.
+            refresh = options["incremental"]
+            checkpoint = IngestionCheckpoint.start(
+                JOB_NAME,
+                params={
+                    "since": since.isoformat() if since else None,
+                    "until": until.isoformat(),
+                    "refresh": refresh,
+                },
+            )
 
-        if next_page:
-            offset += 250
+        if since:
+            self.stdout.write(f"Fetching members updated since {since:%Y-%m-%d %H:%M}...")
         else:
-            print(f"No next page. Ending fetch.")
-            break
+            self.stdout.write("Fetching members from Congress.gov API...")
 
-    print(f"Total members fetched: {len(members)}")
-    return members
+        start = checkpoint.next_offset(PAGE_LIMIT)
+        fetched = 0
+        failed = 0
+        try:
+            for page in iter_member_pages(since, until, start=start):
+                fetched += len(page.items)
+                print(f"Fetched {fetched} members from page {page.offset//PAGE_LIMIT + 1}.")
+                if page.items:
+                    # Every member in an incremental listing changed upstream, so
+                    # refresh their memberships even if they were processed before.
+                    failed += save_members(
+                        page.items,
+                        concurrency=options["concurrency"],
+                        refresh=refresh,
+                        checkpoint=checkpoint,
+                    )
+                checkpoint.complete_page(page.offset)
+        except (CongressApiError, KeyboardInterrupt) as e:
+            checkpoint.finish(IngestionCheckpoint.FAILED)
+            self.stdout.write(
+                self.style.ERROR(f"❌ Sync stopped: {e!r}. Re-run with --resume to continue.")
+            )
+            return
 
+        if not fetched and not since and start == 0:
+            checkpoint.finish(IngestionCheckpoint.FAILED)
+            self.stdout.write(self.style.ERROR("No data received."))
+            return
+
+        if failed:
+            # Advancing the watermark would skip these members' changes for good;
+            # the next --incremental run covers the same window again instead.
+            checkpoint.finish(IngestionCheckpoint.FAILED)
+            self.stdout.write(
+                self.style.ERROR(
+                    f"❌ {failed} members could not be saved; sync watermark not advanced."
+                )
+            )
+            return
+
+        checkpoint.finish()
+        if not refresh:
+            # Already processed members were skipped, so their changes before
+            # ``until`` are not synced and must not be skipped next time too.
+            self.stdout.write(self.style.SUCCESS("Member sync complete"))
+            return
+        SyncWatermark.advance(WATERMARK_RESOURCE, until)
+        self.stdout.write(self.style.SUCCESS(f"Member sync complete through {until}"))
+
+
+def api_datetime(value):
+    return value.astimezone(timezone.utc).strftime(API_DATETIME_FORMAT)
+
+
+def iter_member_pages(since=None, until=None, start=0):
+    """Yields pages of the member list, optionally only members whose
+    ``updateDate`` falls between ``since`` and ``until``."""
+    params = {}
+    if since:
+        params["fromDateTime"] = api_datetime(since)
+        if until:
+            params["toDateTime"] = api_datetime(until)
+    return get_client().iter_pages(
+        "member", "members", limit=PAGE_LIMIT, params=params, start=start
+    )
+
+
+def save_members(members_data, concurrency=0, refresh=False, checkpoint=None):
+    """Saves member data to the database, then fetches details for members
+    that are not fully processed (or all of them with ``refresh``), either
+    with the asyncio engine (``concurrency`` > 0) or a thread pool.
+
+    With a ``checkpoint``, members it already lists as processed are skipped
+    and every saved batch is recorded on it.
+
+    Returns the number of members whose details could not be fetched or saved.
+    """
+    saved_members = upsert_members(members_data)
+    member_pks = [m.pk for m in saved_members]
+    with transaction.atomic():
+        # The upsert rewrote names, images and states, which roster rows copy.
+        refresh_roster(member_pks)
+        notify_changed(
+            members=member_pks,
+            congresses=RosterEntry.objects.filter(member_id__in=member_pks)
+            .values_list("congress_id", flat=True)
+            .distinct(),
+        )
+    already_processed = set(checkpoint.processed_ids) if checkpoint else set()
+    bioguide_ids = [
+        m.bioguide_id for m in saved_members if m.bioguide_id not in already_processed
+    ]
 
-def save_members(members_data):
-    """Saves member data to the database with multithreading for fetching details."""
     members_to_process = []
-
-    for member in members_data:
-        bioguide_id = member.get("bioguideId")
-        name = member.get("name")
-        image_url = member.get("depiction", {}).get("imageUrl", "No Image URL Provided")
-        image_attribution = member.get("depiction", {}).get(
-            "attribution", "No Attribution Provided"
+    for start in range(0, len(bioguide_ids), BATCH_SIZE):
+        members = Member.objects.filter(
+            bioguide_id__in=bioguide_ids[start : start + BATCH_SIZE]
         )
-        state = member.get("state")
-
-        member_obj, _ = Member.objects.update_or_create(
-            bioguide_id=bioguide_id,
-            defaults={
-                "name": name,
-                "image_url": image_url,
-                "image_attribution": image_attribution,
-                "last_updated": datetime.now(),
-                "state": state,
-            },
+        if refresh:
+            # Unflag first so a member whose refresh fails is picked up again.
+            members.update(fully_processed=False)
+        else:
+            members = members.filter(fully_processed=False)
+        members_to_process.extend((m.bioguide_id, m) for m in members)
+    print(len(members_to_process), "members to process.")
+
+    congress_ids = congress_id_map()
+    written = []
+
+    def write_batch(batch):
+        save_member_batch(batch, congress_ids)
+        written.extend(m.bioguide_id for m, _ in batch)
+        if checkpoint:
+            checkpoint.mark_processed(m.bioguide_id for m, _ in batch)
+
+    if concurrency:
+        saved = asyncio.run(
+            sync_members(members_to_process, write_batch, concurrency=concurrency)
         )
+        print(f"✅ Successfully processed {saved} members")
+        return len(members_to_process) - len(written)
 
-        if not member_obj.fully_processed:
-            members_to_process.append((bioguide_id, member_obj))
-        print(len(members_to_process), "members to process.")
     with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
         future_to_member = {
             executor.submit(fetch_all_member_data, m_id): (m_id, m_obj)
             for m_id, m_obj in members_to_process
         }
 
+        batch = []
         for future in as_completed(future_to_member):
             bioguide_id, member_obj = future_to_member[future]
             try:
                 result = future.result()
                 if result and result["details"]:
-                    save_memberships(
-                        member_obj,
-                        result["details"],
-                        result["sponsored_legislation"],
-                        result["cosponsored_legislation"],
-                    )
-                    member_obj.fully_processed = True
-                    member_obj.save()
+                    batch.append((member_obj, result))
                     print(
-                        f"✅ Successfully processed {member_obj.name} ({bioguide_id})"
+                        f"✅ Successfully fetched {member_obj.name} ({bioguide_id})"
                     )
             except Exception as e:
                 print(f"❌ Error processing {member_obj.name} ({bioguide_id}): {e}")
+            if len(batch) >= WRITE_BATCH_SIZE:
+                write_batch(batch)
+                batch = []
+        if batch:
+            write_batch(batch)
+    return len(members_to_process) - len(written)
+
+
+def save_member_batch(batch, congress_ids=None):
+    """Saves memberships for a batch of ``(member_obj, result)`` pairs with
+    one upsert, then flags the members as fully processed."""
+    congress_ids = congress_ids if congress_ids is not None else congress_id_map()
+    memberships = []
+    for member_obj, result in batch:
+        memberships.extend(
+            build_memberships(member_obj, result["details"], congress_ids)
+        )
+    with transaction.atomic():
+        upsert_memberships(memberships)
+        refresh_sponsorship_counts(m.pk for m, _ in batch)
+        Member.objects.filter(pk__in=[m.pk for m, _ in batch]).update(
+            fully_processed=True
+        )
+        refresh_roster(m.pk for m, _ in batch)
+        notify_changed(
+            members=[m.pk for m, _ in batch],
+            congresses=[m.congress_id for m in memberships],
+        )
 
 
 def fetch_member_details(bioguide_id):
     """Fetches details about a single member, including terms and leadership."""
-
-    while True:
-        url = f"{BASE_URL}/member/{bioguide_id}?api_key={API_KEY}"
-        response = throttled_get(url)
-
-        if response.status_code == 200:
-            return response.json().get("member", {})
-        else:
-            print(f"Response: {response.json()}")
-            print(
-                f"Error fetching member details for {bioguide_id}: {response.status_code}"
-            )
-            return None
-
-
-def fetch_sponsored_legislation(bioguide_id):
-    """Fetches sponsored legislation for a member."""
-    counts_by_congress = defaultdict(int)
-    offset = 0
-
-    while True:
-        url = f"{BASE_URL}/member/{bioguide_id}/sponsored-legislation?offset={offset}&limit=250&api_key={API_KEY}"
-        response = throttled_get(url)
-        if response.status_code == 200:
-            data = response.json()
-            pagination_info = data.get("pagination", {})
-            next_page = pagination_info.get("next", None)
-            for item in data.get("sponsoredLegislation", []):
-                congress_number = item.get("congress")
-                if congress_number:
-                    counts_by_congress[congress_number] += 1
-            if next_page:
-                offset += 250
-            else:
-                break
-        else:
-            print(
-                f"Error fetching sponsored legislation for {bioguide_id}: {response.status_code}"
-            )
-            break
-    print(f"Sponsored legislation counts for {bioguide_id}: {counts_by_congress}")
-    return counts_by_congress
-
-
-def fetch_cosponsored_legislation(bioguide_id):
-    counts_by_congress = defaultdict(int)
-    offset = 0
-
-    while True:
-        url = f"{BASE_URL}/member/{bioguide_id}/cosponsored-legislation?offset={offset}&limit=250&api_key={API_KEY}"
-        response = throttled_get(url)
-        if response.status_code == 200:
-            data = response.json()
-            pagination_info = data.get("pagination", {})
-            next_page = pagination_info.get("next", None)
-            for item in data.get("cosponsoredLegislation", []):
-                congress_number = item.get("congress")
-                if congress_number:
-                    counts_by_congress[congress_number] += 1
-            if next_page:
-                offset += 250
-            else:
-                break
-        else:
-            print(
-                f"Error fetching cosponsored legislation for {bioguide_id}: {response.status_code}"
-            )
-            break
-    print(f"Cosponsored legislation counts for {bioguide_id}: {counts_by_congress}")
-    return counts_by_congress
+    try:
+        return get_client().get(f"member/{bioguide_id}").get("member", {})
+    except CongressApiError as e:
+        print(f"Error fetching member details for {bioguide_id}: {e.status_code}")
+        return None
 
 
-def save_memberships(
-    member, member_data, sponsored_legislation, cosponsored_legislation
-):
+def save_memberships(member, member_data):
     """Saves membership history for a given member.
     Creates multiple entries for different terms."""
-
-    # First handle leadership roles
-    for leadership_role in member_data.get("leadership", []):
-        role = leadership_role.get("type")
-        congress_number = leadership_role.get("congress")
-
-        # Find the corresponding membership and update its leadership role
-        try:
-            membership = Membership.objects.get(
-                member=member, congress__congress_number=congress_number
-            )
-            membership.leadership_role = role
-            membership.save()
-        except Membership.DoesNotExist:
-            print(
-                f"No membership found for {member.name} in Congress {congress_number}"
-            )
-
-    for term in member_data.get("terms", []):
-        congress_number = term.get("congress")
-        chamber = term.get("chamber")
-        start_year = term.get("startYear")
-        end_year = term.get("endYear", None)
-        district = (
-            term.get("district", None)
-            if chamber == "House of Representatives"
-            else None
-        )
-
-        # Ensure Congress exists
-        try:
-            congress = Congress.objects.get(congress_number=congress_number)
-        except Congress.DoesNotExist:
-            print(f"❌ Congress {congress_number} not found in DB. Skipping term.")
-            continue
-
-        # Determine party at the time
-        party_history = member_data.get("partyHistory", [])
-        party = next(
-            (p["partyName"] for p in party_history if p["startYear"] <= start_year),
-            "Unknown",
-        )
-        print(
-            f"Saving membership for {member.name} in Congress {congress_number} with {sponsored_legislation.get(congress_number, 0)} sponsored bills."
-        )
-
-        # Create or update Membership record
-        Membership.objects.update_or_create(
-            member=member,
-            congress=congress,
-            defaults={
-                "chamber": chamber,
-                "party": party,
-                "district": district,
-                "start_year": start_year,
-                "end_year": end_year,
-                "sponsored_legislation_count": sponsored_legislation.get(
-                    congress_number, 0
-                ),
-                "cosponsored_legislation_count": cosponsored_legislation.get(
-                    congress_number, 0
-                ),
-            },
-        )
+    memberships = build_memberships(member, member_data, congress_id_map())
+    upsert_memberships(memberships)
+    refresh_sponsorship_counts([member.pk])
+    refresh_roster([member.pk])
+    notify_changed(members=[member.pk], congresses=[m.congress_id for m in memberships])
 
 
 def fetch_all_member_data(bioguide_id):
     details = fetch_member_details(bioguide_id)
     if not details:
         return None
-    sponsored_legislation = fetch_sponsored_legislation(bioguide_id)
-    cosponsored_legislation = fetch_cosponsored_legislation(bioguide_id)
-
-    return {
-        "details": details,
-        "sponsored_legislation": sponsored_legislation,
-        "cosponsored_legislation": cosponsored_legislation,
-    }
+    return {"details": details}
@@ -2,13 +2,24 @@ import yaml
 from django.core.management.base import BaseCommand
 import os
 from congress.models import Member
+from core.models import IngestionCheckpoint
+
+JOB_NAME = "fetch_pre93"
+CHUNK_SIZE = 250
 
 
 class Command(BaseCommand):
 
     help = "Fetches historical legislators data from YAML file."
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue the last unfinished run from its checkpoint",
+        )
+
+    def handle(self, *args, **options):
         main_path = "data/congress-legislators/legislators-historical.yaml"
         full_path = os.path.abspath(main_path)
         print(f"Looking for YAML at: {full_path}")
@@ -24,30 +35,44 @@ class Command(BaseCommand):
         except Exception as e:
             print(f"An error occurred: {e}")
             return
+
+        checkpoint = IngestionCheckpoint.resumable(JOB_NAME) if options["resume"] else None
+        if checkpoint:
+            checkpoint.mark_running()
+            print(f"Resuming at legislator {checkpoint.next_offset(CHUNK_SIZE)}")
+        else:
+            checkpoint = IngestionCheckpoint.start(JOB_NAME, params={"path": main_path})
+
         count=0
-        for legislator in legislators:
-            # Extract bioguide_id from legislator data
-            bioguide_id = legislator.get("id", {}).get("bioguide", "")
-            count+=1
-
-            # Check if member already exists
-            if not Member.objects.filter(bioguide_id=bioguide_id).exists():
-                first_name = legislator.get("name", {}).get("first", "")
-                last_name = legislator.get("name", {}).get("last", "")
-
-                name = ", ".join([last_name, first_name])
-                # Create new member
-                try:
-
-                    Member.objects.create(
-                        name=name,
-                        bioguide_id=bioguide_id,
-                        state=legislator.get("terms", [{}])[-1].get("state", ""),
-                    )
-                    print(f"Created member: {name} with ID: {bioguide_id}")
-                except Exception as e:
-                    print(f"Error creating member {name}: {e}")
-            else:   
-                print(f"Member with bioguide ID {bioguide_id} already exists.")
-                continue
-        print(f"Total members created: {count}")
\ No newline at end of file
+        for offset in range(checkpoint.next_offset(CHUNK_SIZE), len(legislators), CHUNK_SIZE):
+            created_ids = []
+            for legislator in legislators[offset : offset + CHUNK_SIZE]:
+                # Extract bioguide_id from legislator data
+                bioguide_id = legislator.get("id", {}).get("bioguide", "")
+                count+=1
+
+                # Check if member already exists
+                if not Member.objects.filter(bioguide_id=bioguide_id).exists():
+                    first_name = legislator.get("name", {}).get("first", "")
+                    last_name = legislator.get("name", {}).get("last", "")
+
+                    name = ", ".join([last_name, first_name])
+                    # Create new member
+                    try:
+
+                        Member.objects.create(
+                            name=name,
+                            bioguide_id=bioguide_id,
+                            state=legislator.get("terms", [{}])[-1].get("state", ""),
+                        )
+                        created_ids.append(bioguide_id)
+                        print(f"Created member: {name} with ID: {bioguide_id}")
+                    except Exception as e:
+                        print(f"Error creating member {name}: {e}")
+                else:   
+                    print(f"Member with bioguide ID {bioguide_id} already exists.")
+                    continue
+            checkpoint.mark_processed(created_ids)
+            checkpoint.complete_page(offset)
+        checkpoint.finish()
+        print(f"Total members created: {count}")
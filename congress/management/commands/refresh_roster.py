@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from congress.models import Congress
+from congress.roster import refresh_roster
+from core.invalidation import notify_changed
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the denormalized chamber roster from members and memberships."
+
+    def handle(self, *args, **options):
+        written = refresh_roster()
+        notify_changed(congresses=Congress.objects.values_list("id", flat=True))
+        print(f"✅ Rebuilt roster with {written} entries")
@@ -0,0 +1,78 @@
+"""
+Asyncio engine for syncing member details from Congress.gov.
+
+Member details are requested concurrently under the shared ``congress``
+rate limit; sponsorship counts come from locally stored bills instead (see
+``legislation.counts``). Finished members are streamed
+to a writer coroutine that hands them to the database in batches while the
+remaining fetches are still in flight.
+"""
+
+import asyncio
+
+import httpx
+from asgiref.sync import sync_to_async
+
+from core.congress_api import AsyncCongressApiClient
+
+DEFAULT_CONCURRENCY = 20
+BATCH_SIZE = 100
+
+
+async def fetch_member_data(client, bioguide_id):
+    """Fetches the details of one member."""
+    details = await client.get(f"member/{bioguide_id}")
+    return {"details": details.get("member", {})}
+
+
+async def sync_members(members, write_batch, concurrency=DEFAULT_CONCURRENCY, batch_size=BATCH_SIZE):
+    """Fetches and saves ``members`` (a list of ``(bioguide_id, member_obj)``).
+
+    ``write_batch`` is a synchronous callable receiving a list of
+    ``(member_obj, result)`` pairs; it runs in Django's sync thread.
+    Returns the number of members written.
+    """
+    queue = asyncio.Queue(maxsize=batch_size * 2)
+    semaphore = asyncio.Semaphore(concurrency)
+    write = sync_to_async(write_batch)
+    done = object()
+
+    async def worker(client, bioguide_id, member_obj):
+        async with semaphore:
+            try:
+                result = await fetch_member_data(client, bioguide_id)
+            except Exception as e:
+                # One bad member must not abort the others; it is simply
+                # not written, so callers count it as failed.
+                print(f"❌ Error fetching {member_obj.name} ({bioguide_id}): {e}")
+                return
+        if result["details"]:
+            await queue.put((member_obj, result))
+
+    async def writer():
+        written = 0
+        batch = []
+        while True:
+            item = await queue.get()
+            if item is not done:
+                batch.append(item)
+            if batch and (item is done or len(batch) >= batch_size):
+                try:
+                    await write(batch)
+                    written += len(batch)
+                    print(f"✅ Saved {written} members")
+                except Exception as e:
+                    print(f"❌ Error saving batch of {len(batch)} members: {e}")
+                batch = []
+            if item is done:
+                return written
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with AsyncCongressApiClient(limits=limits) as client:
+        writer_task = asyncio.create_task(writer())
+        try:
+            await asyncio.gather(*(worker(client, m_id, m_obj) for m_id, m_obj in members))
+        finally:
+            # Always let the writer flush what was fetched and exit.
+            await queue.put(done)
+        return await writer_task
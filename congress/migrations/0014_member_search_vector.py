@@ -0,0 +1,48 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Keeps congress_member.search_vector current on every insert/update,
+# including the ON CONFLICT DO UPDATE upserts done by member ingestion.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION congress_member_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.bioguide_id, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.state, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER congress_member_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, state, bioguide_id ON congress_member
+    FOR EACH ROW EXECUTE FUNCTION congress_member_search_vector_update();
+
+UPDATE congress_member SET name = name;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS congress_member_search_vector_trigger ON congress_member;
+DROP FUNCTION IF EXISTS congress_member_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('congress', '0013_merge_0010_auto_20250803_1332_0012_membership_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='member_search_vector_gin'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Initial fill; afterwards member ingestion keeps the roster current.
+BACKFILL_ROSTER = """
+INSERT INTO congress_rosterentry
+    (congress_id, chamber, member_id, name, full_name, state, party, district, leadership_role, image_url)
+SELECT
+    ms.congress_id, ms.chamber, m.id, m.name,
+    CASE WHEN position(',' IN m.name) > 0
+        THEN trim(split_part(m.name, ',', 2)) || ' ' || trim(split_part(m.name, ',', 1))
+        ELSE m.name
+    END,
+    m.state, ms.party, ms.district, ms.leadership_role, m.image_url
+FROM congress_membership ms
+JOIN congress_member m ON m.id = ms.member_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('congress', '0015_member_name_trgm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RosterEntry',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('chamber', models.CharField(max_length=25)),
+                ('name', models.CharField(max_length=255)),
+                ('full_name', models.CharField(max_length=255)),
+                ('state', models.CharField(max_length=50)),
+                ('party', models.CharField(max_length=50)),
+                ('district', models.IntegerField(blank=True, null=True)),
+                ('leadership_role', models.CharField(blank=True, max_length=50, null=True)),
+                ('image_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('congress', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='congress.congress')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='congress.member')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['congress', 'chamber', 'name'], name='roster_name_idx'), models.Index(fields=['congress', 'chamber', 'state', 'name'], name='roster_state_name_idx'), models.Index(fields=['congress', 'chamber', 'party', 'state', 'name'], name='roster_party_idx'), models.Index(fields=['congress', 'chamber', 'state', 'district'], name='roster_state_district_idx')],
+                'constraints': [models.UniqueConstraint(fields=('congress', 'member'), name='roster_congress_member_unique')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_ROSTER, migrations.RunSQL.noop),
+    ]
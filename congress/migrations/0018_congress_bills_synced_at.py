@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('congress', '0017_congress_bill_details_synced_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='congress',
+            name='bills_synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
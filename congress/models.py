@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from phonenumber_field.modelfields import PhoneNumberField
 from datetime import datetime
 
@@ -8,6 +10,13 @@ class Congress(models.Model):
     congress_number = models.IntegerField(unique=True)
     start_date = models.DateField()
     end_date = models.DateField()
+    # Set by ``sync_legislation --details`` once every bill of the congress
+    # has its sponsorships stored; sponsorship counts are only recomputed
+    # locally for such congresses (see legislation.counts).
+    bill_details_synced_at = models.DateTimeField(null=True, blank=True)
+    # Set by ``sync_legislation --backfill`` once the congress's bill and law
+    # listings have been stored completely (see legislation.tasks).
+    bills_synced_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-congress_number"]
@@ -41,6 +50,14 @@ class Member(models.Model):
     image_attribution = models.TextField(null=True, blank=True)
     last_updated = models.DateTimeField(auto_now=True)
     fully_processed = models.BooleanField(default=False)
+    # Maintained by a database trigger from name, state and bioguide_id.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="member_search_vector_gin"),
+            GinIndex(fields=["name"], name="member_name_trgm", opclasses=["gin_trgm_ops"]),
+        ]
 
     def full_name(self):
         first = self.name.split(",")[1 if len(self.name.split(",")) > 1 else ""]
@@ -80,6 +97,42 @@ class Membership(models.Model):
         return f"{self.member.name} ({self.chamber} - {self.party}, {self.congress})"
 
 
+class RosterEntry(models.Model):
+    """One card of a chamber roster: a member's term in one congress with
+    everything the roster renders, so a roster page is a single range scan.
+
+    Rebuilt from Member/Membership by ``congress.roster.refresh_roster``
+    whenever member ingestion writes.
+    """
+
+    id = models.AutoField(primary_key=True)
+    congress = models.ForeignKey(Congress, on_delete=models.CASCADE)
+    chamber = models.CharField(max_length=25)
+    member = models.ForeignKey(Member, on_delete=models.CASCADE)
+    name = models.CharField(max_length=255)
+    full_name = models.CharField(max_length=255)
+    state = models.CharField(max_length=50)
+    party = models.CharField(max_length=50)
+    district = models.IntegerField(null=True, blank=True)
+    leadership_role = models.CharField(max_length=50, null=True, blank=True)
+    image_url = models.URLField(max_length=500, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["congress", "member"], name="roster_congress_member_unique")
+        ]
+        # One index per roster sort order.
+        indexes = [
+            models.Index(fields=["congress", "chamber", "name"], name="roster_name_idx"),
+            models.Index(fields=["congress", "chamber", "state", "name"], name="roster_state_name_idx"),
+            models.Index(fields=["congress", "chamber", "party", "state", "name"], name="roster_party_idx"),
+            models.Index(fields=["congress", "chamber", "state", "district"], name="roster_state_district_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.chamber}, {self.congress_id})"
+
+
 class MemberDetails(models.Model):
     id = models.AutoField(primary_key=True)
     member = models.OneToOneField(Member, on_delete=models.CASCADE)
@@ -0,0 +1,64 @@
+"""
+Member profile read-model.
+
+Everything the member page renders comes from one query: the member, its
+MemberDetails row and its terms aggregated into an ordered JSON array, so a
+profile is one database round-trip however many congresses the member
+served in. The page caches each section as a template fragment keyed by the
+member's cache namespace version (see ``core.invalidation``).
+"""
+
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import F, Q
+from django.db.models.functions import JSONObject
+from django.http import Http404
+
+from .models import Member
+
+TERM_FIELDS = (
+    "chamber",
+    "party",
+    "district",
+    "start_year",
+    "end_year",
+    "leadership_role",
+    "sponsored_legislation_count",
+    "cosponsored_legislation_count",
+)
+
+
+def member_profile(pk):
+    """The member page state of member ``pk``; raises Http404 if the member
+    or its details are missing."""
+    terms = JSONObject(
+        congress_number="membership__congress__congress_number",
+        **{field: f"membership__{field}" for field in TERM_FIELDS},
+    )
+    member = (
+        Member.objects.filter(pk=pk)
+        .select_related("memberdetails")
+        .defer("search_vector")
+        .annotate(
+            terms=JSONBAgg(
+                terms,
+                filter=Q(membership__isnull=False),
+                ordering=(
+                    F("membership__start_year").desc(),
+                    F("membership__congress__congress_number").desc(),
+                ),
+            )
+        )
+        .first()
+    )
+    if member is None or not hasattr(member, "memberdetails"):
+        raise Http404("No member profile found.")
+
+    memberships = member.terms or []
+    return {
+        "member": member,
+        "details": member.memberdetails,
+        "memberships": memberships,
+        "most_recent": memberships[0] if memberships else None,
+        "current": any(m["end_year"] is None for m in memberships),
+        "first_year": memberships[-1]["start_year"] if memberships else None,
+    }
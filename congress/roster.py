@@ -0,0 +1,51 @@
+"""
+Keeps the denormalized chamber roster (``RosterEntry``) in step with
+Member/Membership.
+
+Rows are rebuilt per member: every roster row of the given members is
+replaced from their current memberships inside one transaction, so a
+roster page never shows a half-written member.
+"""
+
+from django.db import transaction
+
+from .models import Membership, RosterEntry
+
+BATCH_SIZE = 1000
+
+
+def roster_entry(membership):
+    member = membership.member
+    return RosterEntry(
+        congress_id=membership.congress_id,
+        chamber=membership.chamber,
+        member=member,
+        name=member.name,
+        full_name=member.full_name(),
+        state=member.state,
+        party=membership.party,
+        district=membership.district,
+        leadership_role=membership.leadership_role,
+        image_url=member.image_url,
+    )
+
+
+def refresh_roster(member_ids=None, batch_size=BATCH_SIZE):
+    """Rebuilds the roster rows of ``member_ids`` (every member if None).
+
+    Returns the number of rows written.
+    """
+    memberships = Membership.objects.select_related("member")
+    stale = RosterEntry.objects.all()
+    if member_ids is not None:
+        member_ids = list(member_ids)
+        memberships = memberships.filter(member_id__in=member_ids)
+        stale = stale.filter(member_id__in=member_ids)
+
+    with transaction.atomic():
+        stale.delete()
+        entries = RosterEntry.objects.bulk_create(
+            (roster_entry(m) for m in memberships.iterator(chunk_size=batch_size)),
+            batch_size=batch_size,
+        )
+    return len(entries)
@@ -0,0 +1,13 @@
+from celery import shared_task
+from django.core.management import call_command
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="congress.tasks.sync_members_incremental")
+def sync_members_incremental(concurrency=20):
+    """Scheduled incremental member sync (members changed since the last run)."""
+    logger.info("Starting incremental member sync")
+    call_command("fetch_members", incremental=True, concurrency=concurrency)
+    return "Incremental member sync complete"
@@ -1,10 +1,97 @@
 from django.shortcuts import render, get_object_or_404
-from .models import Congress, Member, Membership, MemberDetails
-from django.db.models import OuterRef, Subquery, Prefetch, Q
-from django.contrib.postgres.search import SearchVector, SearchQuery, TrigramSimilarity, SearchRank
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.core.cache import cache
-from django.views.decorators.cache import cache_page
+from .models import Congress, RosterEntry
+from .profile import member_profile
+from django.db.models import Q
+from django.contrib.postgres.search import SearchQuery
+from django.utils.functional import SimpleLazyObject
+from core.cache_keys import existing_version, make_key, namespace_version
+from core.invalidation import member_namespace, roster_namespace
+from core.pagination import CursorPage, approximate_count, canonical_cursor, keyset_page
+from core.swr import get_or_refresh
+
+SEARCH_CONFIG = "english"
+ROSTER_PAGE_SIZE = 12
+# Rosters and member pages are evicted by ingestion (core.invalidation);
+# past the soft expiry rosters are still served while one request refreshes
+# them (core.swr), and the timeouts only bound memory use.
+ROSTER_FRESH_FOR = 60 * 60
+ROSTER_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+DETAILS_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+# Everything a member card renders plus the sort keys, in cached row order.
+ROSTER_FIELDS = (
+    "id",
+    "name",
+    "member_id",
+    "full_name",
+    "state",
+    "party",
+    "district",
+    "leadership_role",
+    "image_url",
+)
+
+
+def roster_search(search_query, with_district=False):
+    """Filter for the chamber rosters.
+
+    Name, state and bioguide ID are matched against the indexed
+    ``Member.search_vector``; party and district are matched on the roster
+    rows of the (already narrowed) congress and chamber.
+    """
+    condition = Q(member__search_vector=SearchQuery(search_query, config=SEARCH_CONFIG)) | Q(
+        party__istartswith=search_query
+    )
+    if with_district and search_query.isdigit():
+        condition |= Q(district=int(search_query))
+    return condition
+
+
+def roster_page(cache_key, congress_id, chamber, order_by, search_query, cursor, with_district=False):
+    """The roster rows after ``cursor`` as a CursorPage of card dicts, plus
+    the (approximate) roster size.
+
+    Rows are read by keyset over ``order_by`` + id. The size and each page
+    are cached separately, the rows as compact tuples of ROSTER_FIELDS, so a
+    request transfers and unpickles only the 12 cards it renders.
+    """
+    if not congress_id:
+        return CursorPage([]), 0
+
+    roster = RosterEntry.objects.filter(congress_id=congress_id, chamber=chamber)
+    if search_query:
+        roster = roster.filter(roster_search(search_query, with_district=with_district))
+    roster = roster.values(*ROSTER_FIELDS)
+
+    count = get_or_refresh(
+        f"{cache_key}:count",
+        lambda: approximate_count(roster),
+        ROSTER_FRESH_FOR,
+        timeout=ROSTER_CACHE_TIMEOUT,
+    )
+
+    keys = [(field, False) for field in order_by] + [("id", False)]
+    cursor = canonical_cursor(cursor, len(keys))
+
+    def compute_page():
+        page = keyset_page(roster, keys, cursor, ROSTER_PAGE_SIZE)
+        return [tuple(row[f] for f in ROSTER_FIELDS) for row in page], page.next_cursor
+
+    rows, next_cursor = get_or_refresh(
+        f"{cache_key}:page:{cursor}",
+        compute_page,
+        ROSTER_FRESH_FOR,
+        timeout=ROSTER_CACHE_TIMEOUT,
+    )
+    return CursorPage([dict(zip(ROSTER_FIELDS, row)) for row in rows], next_cursor), count
+
+
+def render_roster(request, template, partial, context):
+    if request.headers.get("HX-Request"):
+        # Infinite scroll asks for the rows after a cursor only.
+        if request.GET.get("cursor"):
+            return render(request, "congress/partials/roster_rows.html", context)
+        return render(request, partial, context)
+    return render(request, template, context)
 
 
 def congress(request):
@@ -18,7 +105,7 @@ def congress(request):
 
 def house_not_home(request):
     congress_id = request.GET.get("congress")
-    page = request.GET.get("page")
+    cursor = request.GET.get("cursor")
     sort_by = request.GET.get("sort", "state_name")
     search_query = request.GET.get("search", "").strip()
 
@@ -33,85 +120,35 @@ def house_not_home(request):
     congress = get_object_or_404(Congress, id=congress_id) if congress_id else None
     chamber = "House of Representatives"
 
-    cache_key_parts = [f"congress_{congress_id}_house_members"]
-    if search_query:
-        cache_key_parts.append(f"search_{hash(search_query)}")
-    cache_key_parts.append(f"sort_{sort_by}")
-    congress_cache_key = "_".join(cache_key_parts)
-
-    cached_data = cache.get(congress_cache_key)
-
-    if cached_data is not None:
-        house_members = cached_data["queryset"]
-    elif congress:
-        membership_qs = Membership.objects.filter(
-            congress=congress_id, chamber=chamber, member=OuterRef("pk")
-        ).order_by("-start_year")
-
-        house_members = (
-            Member.objects.filter(
-                membership__congress=congress_id,
-                membership__chamber=chamber,
-            )
-            .select_related("memberdetails")
-            .prefetch_related(
-                Prefetch(
-                    "membership_set",
-                    queryset=Membership.objects.filter(
-                        congress=congress_id
-                    ).select_related("congress"),
-                    to_attr="congress_memberships",
-                )
-            )
-            .annotate(
-                party=Subquery(membership_qs.values("party")[:1]),
-                district=Subquery(membership_qs.values("district")[:1]),
-                leadership_role=Subquery(membership_qs.values("leadership_role")[:1]),
-            )
-        )
-
-        if search_query:
-            vector = SearchVector("name", "state", "party", "district", "bioguide_id", config="english")
-            query = SearchQuery(search_query, config="english")
-            house_members = house_members.annotate(search=vector).filter(search=query)
-
-        house_members = house_members.order_by(*order_by)
-        cache_data = {"queryset": list(house_members)}
-        cache.set(congress_cache_key, cache_data, 60 * 60 * 6)
-        
-    else:
-        house_members = Member.objects.none()
-
-    p = Paginator(house_members, 12)
-    try:
-        members_page = p.page(page)
-    except PageNotAnInteger:
-        members_page = p.page(1)
-    except EmptyPage:
-        members_page = p.page(p.num_pages)
-
-    current_page_number = members_page.number
-    page_range = p.get_elided_page_range(current_page_number, on_each_side=2, on_ends=0)
+    congress_cache_key = make_key(
+        roster_namespace(congress_id), chamber=chamber, sort=sort_by, query=search_query
+    )
+
+    members_page, total_count = roster_page(
+        congress_cache_key, congress_id, chamber, order_by, search_query, cursor, with_district=True
+    )
 
     context = {
         "congress_number": congress.congress_number if congress else "Unknown",
         "house_members": members_page,
+        "members": members_page,
+        "next_cursor": members_page.next_cursor,
+        "total_count": total_count,
         "congress_id": congress_id,
-        "page_range": page_range,
         "current_sort": sort_by,
         "sort_options": sort_options.keys(),
         "search_query": search_query,
         "cache_key": congress_cache_key,
     }
 
-    if request.headers.get("HX-Request"):
-        return render(request, "congress/partials/house_partial.html", context)
-    return render(request, "congress/house.html", context)
+    return render_roster(
+        request, "congress/house.html", "congress/partials/house_partial.html", context
+    )
 
 
 def i_am_the_senate(request):
     congress_id = request.GET.get("congress")
-    page = request.GET.get("page")
+    cursor = request.GET.get("cursor")
     sort_by = request.GET.get("sort", "state_name")
     search_query = request.GET.get("search", "").strip()
 
@@ -125,93 +162,44 @@ def i_am_the_senate(request):
     congress = get_object_or_404(Congress, id=congress_id) if congress_id else None
     chamber = "Senate"
 
-    cache_key_parts = [f"congress_{congress_id}_senate_members"]
-    if search_query:
-        cache_key_parts.append(f"search_{hash(search_query)}")
-    cache_key_parts.append(f"sort_{sort_by}")
-    congress_cache_key = "_".join(cache_key_parts)
-
-    cached_data = cache.get(congress_cache_key)
-
-    if cached_data is not None:
-        senate_members = cached_data["queryset"]
-    elif congress:
-        membership_qs = Membership.objects.filter(
-            congress=congress_id, chamber=chamber, member=OuterRef("pk")
-        ).order_by("-start_year")
-
-        senate_members = (
-            Member.objects.filter(
-                membership__congress=congress_id,
-                membership__chamber=chamber,
-            )
-            .select_related("memberdetails")
-            .prefetch_related(
-                Prefetch(
-                    "membership_set",
-                    queryset=Membership.objects.filter(
-                        congress=congress_id
-                    ).select_related("congress"),
-                    to_attr="congress_memberships",
-                )
-            )
-            .annotate(
-                party=Subquery(membership_qs.values("party")[:1]),
-                leadership_role=Subquery(membership_qs.values("leadership_role")[:1]),
-            )
-        )
-
-        if search_query:
-            senate_members = senate_members.annotate(
-
-                search=SearchVector("name", "state", "party", config="english")
-            ).filter(search=SearchQuery(search_query, config="english"))
-
-        senate_members = senate_members.order_by(*order_by)
-        cache_data = {"queryset": list(senate_members)}
-        cache.set(congress_cache_key, cache_data, 60 * 60 * 6)
-    else:
-        senate_members = Member.objects.none()
-
-    p = Paginator(senate_members, 12)
-    try:
-        members_page = p.page(page)
-    except PageNotAnInteger:
-        members_page = p.page(1)
-    except EmptyPage:
-        members_page = p.page(p.num_pages)
-    current_page_number = members_page.number
-    page_range = p.get_elided_page_range(current_page_number, on_each_side=2, on_ends=0)
+    congress_cache_key = make_key(
+        roster_namespace(congress_id), chamber=chamber, sort=sort_by, query=search_query
+    )
+
+    members_page, total_count = roster_page(
+        congress_cache_key, congress_id, chamber, order_by, search_query, cursor
+    )
 
     context = {
         "congress_number": congress.congress_number if congress else "Unknown",
         "senate_members": members_page,
-        "page_range": page_range,
+        "members": members_page,
+        "next_cursor": members_page.next_cursor,
+        "total_count": total_count,
         "congress_id": congress_id,
         "current_sort": sort_by,
         "sort_options": sort_options.keys(),
         "search_query": search_query,
     }
-    if request.headers.get("HX-Request"):
-        return render(request, "congress/partials/senate_partial.html", context)
-    return render(request, "congress/senate.html", context)
+    return render_roster(
+        request, "congress/senate.html", "congress/partials/senate_partial.html", context
+    )
 
-@cache_page(60 * 15) 
 def details(request, pk):
-    member = get_object_or_404(Member, pk=pk)
-    member_details = get_object_or_404(MemberDetails, member=member)
-    memberships = Membership.objects.filter(member=member).order_by("-start_year")
-    current = any(m.is_current() for m in memberships)
-
-    most_recent_membership = memberships.first() if memberships else None
-    memberships.first_year = memberships.last().start_year if memberships else None
-
+    """Member page. Each section is a template fragment cached under the
+    member's namespace version, and the profile query only runs when one
+    of them has to be rendered."""
+    profile = SimpleLazyObject(lambda: member_profile(pk))
+    version = existing_version(member_namespace(pk))
+    if version is None:
+        # Nothing can be cached yet; raise Http404 for unknown pks before a
+        # version key is created for them.
+        profile = member_profile(pk)
+        version = namespace_version(member_namespace(pk))
     context = {
-        "member_details": member_details,
-        "member": member,
-        "current": current,
-        "memberships": memberships,
-        "most_recent_membership": most_recent_membership,
+        "profile": profile,
+        "member_pk": pk,
+        "member_version": version,
+        "fragment_timeout": DETAILS_CACHE_TIMEOUT,
     }
-
     return render(request, "congress/member_detail.html", context)
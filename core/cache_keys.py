@@ -0,0 +1,61 @@
+"""
+Cache keys that are identical in every process.
+
+Keys are built from a SHA-256 digest of the normalized key parts instead of
+Python's per-process ``hash()``, so every worker shares the same entries.
+Each namespace also carries a version number stored in the cache; bumping it
+orphans every key of that namespace at once, which is how ingestion
+invalidates cached pages.
+
+    key = make_key("roster:118", chamber="Senate", sort="name", query="")
+    cache.get(f"{key}:page:2")
+"""
+
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+
+# Bump when the shape of any cached payload changes.
+SCHEMA_VERSION = 1
+
+
+def normalize(value):
+    """Case and whitespace insensitive form of a key part."""
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    return value
+
+
+def digest(**parts):
+    payload = json.dumps({k: normalize(v) for k, v in parts.items()}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _fresh_version():
+    # Not 1: if a version key is evicted, restarting from a used number
+    # would resurrect the entries cached under it.
+    return time.time_ns()
+
+
+def namespace_version(namespace):
+    return cache.get_or_set(f"ns:{namespace}:version", _fresh_version, None)
+
+
+def existing_version(namespace):
+    """The version of ``namespace`` if one was created, without creating it."""
+    return cache.get(f"ns:{namespace}:version")
+
+
+def bump_namespace(namespace):
+    """Invalidates every key of ``namespace``."""
+    key = f"ns:{namespace}:version"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), None)
+
+
+def make_key(namespace, **parts):
+    return f"{namespace}:s{SCHEMA_VERSION}:v{namespace_version(namespace)}:{digest(**parts)}"
@@ -0,0 +1,290 @@
+"""
+Shared client for the Congress.gov v3 API.
+
+Every ingestion command, Celery task and view talks to Congress.gov through
+this module so that requests reuse a small pool of keep-alive connections
+instead of paying a new TCP+TLS handshake per call. Each request first draws
+a token from the shared ``congress`` rate-limit bucket.
+
+    client = get_client()
+    member = client.get("member/L000174")["member"]
+    for bill in client.paginate("bill/119", "bills"):
+        ...
+
+    async with AsyncCongressApiClient() as client:
+        members = await client.fetch_all("member", "members")
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterator
+from urllib.parse import urlsplit
+
+import httpx
+from django.conf import settings
+
+from .rate_limit import get_bucket
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://api.congress.gov/v3"
+API_HOST = "api.congress.gov"
+PAGE_LIMIT = 250
+TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_BUCKET = "congress"
+
+
+class CongressApiError(Exception):
+    """Raised when Congress.gov returns an error or cannot be reached."""
+
+    def __init__(self, message, status_code=None, url=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.url = url
+
+
+@dataclass
+class Page:
+    """One page of a paginated Congress.gov listing."""
+
+    items: list[dict[str, Any]]
+    offset: int
+    limit: int
+    count: int | None = None
+    next_url: str | None = None
+    raw: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def has_next(self) -> bool:
+        return bool(self.next_url)
+
+
+def build_url(path: str) -> str:
+    """Turn an API path (or a full Congress.gov URL) into an absolute URL.
+
+    Full URLs are only accepted for the Congress.gov host so that the API key
+    is never sent anywhere else.
+    """
+    if path.startswith("http://") or path.startswith("https://"):
+        parts = urlsplit(path)
+        if parts.hostname != API_HOST:
+            raise CongressApiError(f"Refusing to call non Congress.gov URL: {path}")
+        return f"https://{API_HOST}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+    if path.startswith(API_HOST):
+        return build_url(f"https://{path}")
+    return f"{BASE_URL}/{path.lstrip('/')}"
+
+
+def backoff_delay(attempt: int, retry_after: str | None = None) -> float:
+    """Seconds to wait before retry number ``attempt`` (full jitter)."""
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_CAP)
+        except ValueError:
+            pass
+    ceiling = min(BACKOFF_CAP, BACKOFF_BASE * (2**attempt))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def _params(params: dict[str, Any] | None) -> dict[str, Any]:
+    merged = {"format": "json"}
+    if params:
+        merged.update({k: v for k, v in params.items() if v is not None})
+    merged["api_key"] = settings.CONGRESS_API_KEY
+    return merged
+
+
+def _should_retry(response: httpx.Response) -> bool:
+    if response.status_code == 429:
+        # Someone else is spending the same key; stop handing out tokens.
+        get_bucket(RATE_LIMIT_BUCKET).drain()
+    return response.status_code in RETRY_STATUSES
+
+
+def _to_page(data: dict[str, Any], key: str, offset: int, limit: int) -> Page:
+    pagination = data.get("pagination", {})
+    return Page(
+        items=data.get(key, []) or [],
+        offset=offset,
+        limit=limit,
+        count=pagination.get("count"),
+        next_url=pagination.get("next"),
+        raw=data,
+    )
+
+
+def _error(response: httpx.Response, url: str) -> CongressApiError:
+    return CongressApiError(
+        f"Congress.gov returned {response.status_code} for {url}",
+        status_code=response.status_code,
+        url=url,
+    )
+
+
+class CongressApiClient:
+    """Thread-safe synchronous client backed by a pooled ``httpx.Client``."""
+
+    def __init__(self, timeout=TIMEOUT, limits=LIMITS, max_retries=MAX_RETRIES):
+        self.max_retries = max_retries
+        self._http = httpx.Client(timeout=timeout, limits=limits)
+
+    def close(self):
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self, path: str, params: dict[str, Any] | None = None) -> httpx.Response:
+        url = build_url(path)
+        attempt = 0
+        while True:
+            get_bucket(RATE_LIMIT_BUCKET).acquire()
+            try:
+                response = self._http.get(url, params=_params(params))
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise CongressApiError(f"Could not reach Congress.gov: {e}", url=url) from e
+                delay = backoff_delay(attempt)
+                logger.warning(f"Transport error on {url}, retrying in {delay:.1f}s: {e}")
+            else:
+                if not _should_retry(response) or attempt >= self.max_retries:
+                    return response
+                delay = backoff_delay(attempt, response.headers.get("retry-after"))
+                logger.warning(
+                    f"Congress.gov returned {response.status_code} for {url}, retrying in {delay:.1f}s"
+                )
+            attempt += 1
+            time.sleep(delay)
+
+    def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """GET a path and return the decoded JSON body, raising on errors."""
+        response = self.request(path, params)
+        if response.status_code != 200:
+            raise _error(response, build_url(path))
+        return response.json()
+
+    def get_page(self, path, key, offset=0, limit=PAGE_LIMIT, params=None) -> Page:
+        data = self.get(path, {**(params or {}), "offset": offset, "limit": limit})
+        return _to_page(data, key, offset, limit)
+
+    def iter_pages(self, path, key, limit=PAGE_LIMIT, params=None, start=0) -> Iterator[Page]:
+        offset = start
+        while True:
+            page = self.get_page(path, key, offset=offset, limit=limit, params=params)
+            yield page
+            if not page.items or not page.has_next:
+                break
+            offset += limit
+
+    def paginate(self, path, key, limit=PAGE_LIMIT, params=None) -> Iterator[dict[str, Any]]:
+        """Yield every item of a paginated listing, following ``pagination.next``."""
+        for page in self.iter_pages(path, key, limit=limit, params=params):
+            yield from page.items
+
+
+class AsyncCongressApiClient:
+    """Asyncio counterpart of :class:`CongressApiClient`.
+
+    Must be used as an async context manager so the underlying
+    ``httpx.AsyncClient`` is bound to the running event loop.
+    """
+
+    def __init__(self, timeout=TIMEOUT, limits=LIMITS, max_retries=MAX_RETRIES):
+        self.max_retries = max_retries
+        self._http = httpx.AsyncClient(timeout=timeout, limits=limits)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def request(self, path, params=None) -> httpx.Response:
+        url = build_url(path)
+        attempt = 0
+        while True:
+            await get_bucket(RATE_LIMIT_BUCKET).acquire_async()
+            try:
+                response = await self._http.get(url, params=_params(params))
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise CongressApiError(f"Could not reach Congress.gov: {e}", url=url) from e
+                delay = backoff_delay(attempt)
+                logger.warning(f"Transport error on {url}, retrying in {delay:.1f}s: {e}")
+            else:
+                if not _should_retry(response) or attempt >= self.max_retries:
+                    return response
+                delay = backoff_delay(attempt, response.headers.get("retry-after"))
+                logger.warning(
+                    f"Congress.gov returned {response.status_code} for {url}, retrying in {delay:.1f}s"
+                )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, path, params=None) -> dict[str, Any]:
+        response = await self.request(path, params)
+        if response.status_code != 200:
+            raise _error(response, build_url(path))
+        return response.json()
+
+    async def get_page(self, path, key, offset=0, limit=PAGE_LIMIT, params=None) -> Page:
+        data = await self.get(path, {**(params or {}), "offset": offset, "limit": limit})
+        return _to_page(data, key, offset, limit)
+
+    async def iter_pages(self, path, key, limit=PAGE_LIMIT, params=None) -> AsyncIterator[Page]:
+        offset = 0
+        while True:
+            page = await self.get_page(path, key, offset=offset, limit=limit, params=params)
+            yield page
+            if not page.items or not page.has_next:
+                break
+            offset += limit
+
+    async def fetch_all(self, path, key, limit=PAGE_LIMIT, params=None) -> list[dict[str, Any]]:
+        """Fetch every item of a listing, requesting all remaining pages at once.
+
+        The first page tells us the total ``count``; the rest of the offsets
+        are then gathered concurrently instead of walked one by one.
+        """
+        first = await self.get_page(path, key, offset=0, limit=limit, params=params)
+        items = list(first.items)
+        if not first.has_next or not first.count:
+            return items
+        pages = await asyncio.gather(
+            *(
+                self.get_page(path, key, offset=offset, limit=limit, params=params)
+                for offset in range(limit, first.count, limit)
+            )
+        )
+        for page in pages:
+            items.extend(page.items)
+        return items
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> CongressApiClient:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = CongressApiClient()
+    return _client
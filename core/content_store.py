@@ -0,0 +1,122 @@
+"""
+Local content-addressed store for downloaded documents and Gemini output.
+
+PDFs are stored once under their SHA-256 digest, with a small URL index so a
+known URL is never downloaded again. Summaries are stored per document digest
+and a key derived from the model, prompt and response schema, so identical
+text is never summarized twice, even when it moves to a new URL.
+
+    <root>/blobs/ab/abcdef...            document bytes
+    <root>/urls/<sha256(url)>            digest of the document at that URL
+    <root>/summaries/ab/abcdef.../<key>.json
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import httpx
+from django.conf import settings
+
+DOWNLOAD_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def summary_key(model, prompt, schema=None) -> str:
+    """Version key for a summary: changes whenever the model, prompt or
+    response schema changes."""
+    payload = json.dumps({"model": model, "prompt": prompt, "schema": schema}, sort_keys=True)
+    return sha256(payload.encode())[:16]
+
+
+class ContentStore:
+    def __init__(self, root):
+        self.root = Path(root)
+        self._http = None
+        self._http_lock = threading.Lock()
+
+    def _write(self, path: Path, data: bytes):
+        """Atomically writes ``data`` so readers never see a partial file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _blob_path(self, digest):
+        return self.root / "blobs" / digest[:2] / digest
+
+    def _url_path(self, url):
+        return self.root / "urls" / sha256(url.encode())
+
+    def _summary_path(self, digest, key):
+        return self.root / "summaries" / digest[:2] / digest / f"{key}.json"
+
+    def put_blob(self, data: bytes) -> str:
+        digest = sha256(data)
+        path = self._blob_path(digest)
+        if not path.exists():
+            self._write(path, data)
+        return digest
+
+    def get_blob(self, digest):
+        try:
+            return self._blob_path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def digest_for_url(self, url):
+        """Digest of the document previously downloaded from ``url``, if stored."""
+        try:
+            digest = self._url_path(url).read_text().strip()
+        except FileNotFoundError:
+            return None
+        return digest if self._blob_path(digest).exists() else None
+
+    def fetch(self, url):
+        """Returns ``(digest, data)`` for ``url``, downloading it only once."""
+        digest = self.digest_for_url(url)
+        if digest:
+            return digest, self.get_blob(digest)
+        response = self.http.get(url, follow_redirects=True)
+        response.raise_for_status()
+        digest = self.put_blob(response.content)
+        self._write(self._url_path(url), digest.encode())
+        return digest, response.content
+
+    def get_summary(self, digest, key):
+        try:
+            return json.loads(self._summary_path(digest, key).read_text())
+        except FileNotFoundError:
+            return None
+
+    def put_summary(self, digest, key, summary):
+        self._write(self._summary_path(digest, key), json.dumps(summary).encode())
+
+    @property
+    def http(self):
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = httpx.Client(timeout=DOWNLOAD_TIMEOUT)
+        return self._http
+
+
+_store = None
+
+
+def get_store() -> ContentStore:
+    global _store
+    if _store is None:
+        _store = ContentStore(settings.CONTENT_STORE_ROOT)
+    return _store
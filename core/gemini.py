@@ -0,0 +1,133 @@
+"""
+Gemini summarization of PDFs, backed by the content store.
+
+A document is downloaded at most once and summarized at most once per
+model/prompt/schema; repeat calls are served from ``core.content_store``
+without spending Gemini quota. Requests that do reach Gemini are scheduled
+against the shared RPM, TPM (estimated from the PDF's page count) and daily
+request budgets.
+"""
+
+import json
+import logging
+import os
+import re
+
+from google import genai
+from google.genai import types
+from redis.exceptions import RedisError
+
+from .content_store import get_store, summary_key
+from .locks import redis_lock
+from .redis_client import get_redis
+from .rate_limit import RateLimitExceeded, get_bucket, is_rate_limit_error, throttle_gemini
+
+logger = logging.getLogger(__name__)
+
+# Gemini bills every PDF page as 258 input tokens; the prompt and the JSON
+# response add roughly another couple of thousand.
+TOKENS_PER_PDF_PAGE = 258
+TOKENS_PER_REQUEST = 2000
+BYTES_PER_PAGE_FALLBACK = 3000
+PDF_PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?!s)")
+RATE_LIMIT_RETRY_AFTER = 60
+SUMMARY_LOCK_TIMEOUT = 60 * 5
+IDEMPOTENCY_PREFIX = "repcheck:gemini:summary"
+IDEMPOTENCY_TTL = 60 * 60 * 24 * 30
+
+
+class GeminiRateLimited(RateLimitExceeded):
+    """Gemini answered 429 despite the shared buckets; retry later."""
+
+    retry_after = RATE_LIMIT_RETRY_AFTER
+
+
+class SummaryInProgress(RateLimitExceeded):
+    """Another worker is summarizing the same document; retry shortly and
+    the stored result will be used instead of a second Gemini call."""
+
+    retry_after = 30
+
+
+def estimate_pdf_tokens(data: bytes) -> int:
+    """Estimates the input tokens a PDF will cost, for TPM scheduling."""
+    pages = len(PDF_PAGE_PATTERN.findall(data)) or max(1, len(data) // BYTES_PER_PAGE_FALLBACK)
+    return pages * TOKENS_PER_PDF_PAGE + TOKENS_PER_REQUEST
+
+
+def get_gemini_client():
+    return genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+
+
+def _idempotency_key(digest, key):
+    return f"{IDEMPOTENCY_PREFIX}:{digest}:{key}"
+
+
+def _shared_summary(digest, key):
+    """Summary recorded in Redis by any worker, on any host."""
+    try:
+        raw = get_redis().get(_idempotency_key(digest, key))
+    except RedisError:
+        return None
+    return json.loads(raw) if raw else None
+
+
+def _record_summary(digest, key, data):
+    try:
+        get_redis().set(_idempotency_key(digest, key), json.dumps(data), ex=IDEMPOTENCY_TTL)
+    except RedisError as e:
+        logger.warning(f"Could not record summary {digest[:12]} in Redis: {e}")
+
+
+def summarize_pdf(url, prompt, response_schema, model, client=None):
+    """Returns the decoded JSON Gemini produces for the PDF at ``url``.
+
+    The (document digest, model/prompt/schema) pair is the idempotency key:
+    a result already produced locally or by another worker is reused, and
+    only the worker holding the key's lock calls Gemini. Others raise
+    SummaryInProgress so their task retries once the result exists.
+    """
+    store = get_store()
+    digest, doc_data = store.fetch(url)
+    key = summary_key(model, prompt, response_schema)
+
+    cached = store.get_summary(digest, key) or _shared_summary(digest, key)
+    if cached is not None:
+        logger.info(f"Using stored summary for {url} ({digest[:12]})")
+        store.put_summary(digest, key, cached)
+        return cached
+
+    with redis_lock(f"gemini:{digest}:{key}", SUMMARY_LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            raise SummaryInProgress(f"Summary of {digest[:12]} is already being generated")
+
+        # Another worker may have finished between the check and the lock.
+        cached = _shared_summary(digest, key)
+        if cached is not None:
+            store.put_summary(digest, key, cached)
+            return cached
+
+        client = client or get_gemini_client()
+        throttle_gemini(estimate_pdf_tokens(doc_data))
+        try:
+            response = client.models.generate_content(
+                model=model,
+                contents=[
+                    types.Part.from_bytes(data=doc_data, mime_type="application/pdf"),
+                    prompt,
+                ],
+                config={
+                    "response_mime_type": "application/json",
+                    "response_schema": response_schema,
+                },
+            )
+        except Exception as e:
+            if is_rate_limit_error(e):
+                get_bucket("gemini_rpm").drain()
+                raise GeminiRateLimited(str(e)) from e
+            raise
+
+        data = json.loads(response.text)
+        store.put_summary(digest, key, data)
+        _record_summary(digest, key, data)
+        return data
@@ -0,0 +1,89 @@
+"""
+Precomputed landing page state.
+
+The home page renders a snapshot built from the local database (newest
+bills, the latest daily record digest and a few counts) that background
+tasks rebuild; a request never waits on Congress.gov. A snapshot older than
+``HOME_FRESH_FOR`` is still served while one refresh is queued
+(stale-while-revalidate).
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+from django.db.models import F
+
+from congress.models import Congress, RosterEntry
+from legislation.models import Bills
+
+from .models import DailyCongressRecord
+from .pagination import approximate_count
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "home:snapshot"
+REFRESH_GUARD_KEY = "home:snapshot:refreshing"
+HOME_FRESH_FOR = 60 * 15
+REFRESH_GUARD_TIMEOUT = 60 * 5
+LATEST_BILLS = 12
+
+
+def latest_bills(congress):
+    if congress is None:
+        return []
+    bills = (
+        Bills.objects.filter(congress=congress)
+        .order_by(F("latest_action_date").desc(nulls_last=True), "-id")
+        .values(
+            "id", "title", "type", "number", "originChamber", "url",
+            "latest_action_date", "law_number", "law_type",
+        )[:LATEST_BILLS]
+    )
+    return [{**bill, "congress": congress.congress_number} for bill in bills]
+
+
+def build_home_snapshot():
+    """Builds the home page state from the database and caches it."""
+    congress = Congress.get_current_congress_object()
+    record = DailyCongressRecord.objects.order_by("-issue_date").first()
+
+    counts = {}
+    if congress is not None:
+        bills = Bills.objects.filter(congress=congress)
+        counts = {
+            "members": RosterEntry.objects.filter(congress=congress).count(),
+            "bills": approximate_count(bills),
+            "laws": bills.filter(law_number__isnull=False).count(),
+        }
+
+    snapshot = {
+        "built_at": time.time(),
+        "congress_number": congress.congress_number if congress else None,
+        "bills": latest_bills(congress),
+        "summary": record.summary if record else None,
+        "url": record.pdf_url if record else None,
+        "issue_date": record.issue_date if record else None,
+        "counts": counts,
+    }
+    cache.set(SNAPSHOT_KEY, snapshot, None)
+    cache.delete(REFRESH_GUARD_KEY)
+    return snapshot
+
+
+def get_home_snapshot():
+    """The cached snapshot, queueing one background refresh when stale."""
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is None:
+        return build_home_snapshot()
+
+    stale = time.time() - snapshot["built_at"] > HOME_FRESH_FOR
+    if stale and cache.add(REFRESH_GUARD_KEY, True, REFRESH_GUARD_TIMEOUT):
+        from .tasks import refresh_home_snapshot
+
+        try:
+            refresh_home_snapshot.delay()
+        except Exception as e:
+            # No broker: keep serving the stale snapshot.
+            logger.warning(f"Could not queue home snapshot refresh: {e}")
+    return snapshot
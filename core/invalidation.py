@@ -0,0 +1,71 @@
+"""
+Cache invalidation driven by ingestion writes.
+
+Ingestion calls ``notify_changed`` with the keys it wrote; once the
+transaction commits, ``data_changed`` is sent and the receiver below bumps
+the cache namespace of every affected roster, member page, bill, bill
+listing and the search results. Views build their keys inside those
+namespaces (see ``core.cache_keys``), so they can cache for days and still
+never serve a page older than the last sync.
+
+    notify_changed(members=[member.pk], congresses=[congress.pk])
+    notify_changed(bills=[(119, "hr", "1234")])
+"""
+
+from django.db import transaction
+from django.dispatch import Signal, receiver
+
+from congress.models import Congress
+
+from .cache_keys import bump_namespace
+from .search import invalidate_search
+
+# Sent with ``members`` (Member pks), ``congresses`` (Congress pks) and
+# ``bills`` ((congress number, type, number) tuples).
+data_changed = Signal()
+
+
+def roster_namespace(congress_id):
+    return f"roster:{congress_id}"
+
+
+def legislation_namespace(congress_id):
+    return f"legislation:{congress_id}"
+
+
+def member_namespace(member_id):
+    return f"member:{member_id}"
+
+
+def bill_namespace(congress_number, bill_type, number):
+    return f"bill:{congress_number}:{str(bill_type).lower()}:{number}"
+
+
+def notify_changed(members=(), congresses=(), bills=()):
+    """Announces written keys once the surrounding transaction commits."""
+    members, congresses, bills = set(members), set(congresses), set(bills)
+    if not (members or congresses or bills):
+        return
+    transaction.on_commit(
+        lambda: data_changed.send(
+            sender=None, members=members, congresses=congresses, bills=bills
+        )
+    )
+
+
+@receiver(data_changed)
+def evict_dependent_caches(sender, members, congresses, bills, **kwargs):
+    for congress_id in congresses:
+        bump_namespace(roster_namespace(congress_id))
+    for member_id in members:
+        bump_namespace(member_namespace(member_id))
+    for bill in bills:
+        bump_namespace(bill_namespace(*bill))
+    numbers = {congress_number for congress_number, _, _ in bills}
+    if numbers:
+        # Listings are keyed by Congress pk, bills by congress number.
+        for congress_id in Congress.objects.filter(congress_number__in=numbers).values_list(
+            "id", flat=True
+        ):
+            bump_namespace(legislation_namespace(congress_id))
+    invalidate_search()
@@ -0,0 +1,46 @@
+"""
+Short-lived distributed locks in Redis, used to keep overlapping Celery runs
+and retries from doing the same work twice.
+
+    with redis_lock("bill:119:hr:1", timeout=600) as acquired:
+        if not acquired:
+            return "already in progress"
+        ...
+"""
+
+import logging
+from contextlib import contextmanager
+
+from redis.exceptions import LockError, RedisError
+
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "repcheck:lock"
+
+
+@contextmanager
+def redis_lock(name, timeout):
+    """Tries once to take the lock ``name`` for at most ``timeout`` seconds.
+
+    Yields whether the lock was acquired. If Redis is unreachable the body
+    still runs (yielding True) rather than stalling ingestion.
+    """
+    lock = get_redis().lock(f"{KEY_PREFIX}:{name}", timeout=timeout, blocking=False)
+    try:
+        acquired = lock.acquire()
+    except RedisError as e:
+        logger.warning(f"Could not take lock {name}, continuing without it: {e}")
+        yield True
+        return
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except (LockError, RedisError) as e:
+                # Expired or Redis went away; either way it is no longer ours.
+                logger.warning(f"Could not release lock {name}: {e}")
@@ -1,4 +1,6 @@
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.db.models import F, Func, Value
 
 # Create your models here.
 
@@ -13,4 +15,95 @@ class DailyCongressRecord(models.Model):
 
     class Meta:
         verbose_name = "Daily Congressional Record"
-        verbose_name_plural = "Daily Congressional Records"
\ No newline at end of file
+        verbose_name_plural = "Daily Congressional Records"
+
+class SyncWatermark(models.Model):
+    """High-water mark of the last successful incremental sync of a resource."""
+
+    resource = models.CharField(max_length=50, unique=True)
+    synced_through = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def get_for(cls, resource):
+        watermark = cls.objects.filter(resource=resource).first()
+        return watermark.synced_through if watermark else None
+
+    @classmethod
+    def advance(cls, resource, synced_through):
+        cls.objects.update_or_create(
+            resource=resource, defaults={"synced_through": synced_through}
+        )
+
+    def __str__(self):
+        return f"{self.resource} synced through {self.synced_through}"
+
+
+class IngestionCheckpoint(models.Model):
+    """Progress of one run of a bulk ingestion command, so that a run that
+    dies partway can be resumed with ``--resume`` instead of starting over."""
+
+    RUNNING = "running"
+    FAILED = "failed"
+    COMPLETED = "completed"
+    STATUS_CHOICES = [
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+        (COMPLETED, "Completed"),
+    ]
+
+    job = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=RUNNING)
+    params = models.JSONField(default=dict, blank=True)
+    last_offset = models.IntegerField(null=True, blank=True)
+    processed_ids = ArrayField(models.CharField(max_length=20), default=list, blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["job", "status", "-started_at"])]
+
+    @classmethod
+    def start(cls, job, params=None):
+        return cls.objects.create(job=job, params=params or {})
+
+    @classmethod
+    def resumable(cls, job):
+        """The most recent unfinished run of ``job``, if any."""
+        return (
+            cls.objects.filter(job=job)
+            .exclude(status=cls.COMPLETED)
+            .order_by("-started_at")
+            .first()
+        )
+
+    def next_offset(self, page_size):
+        return 0 if self.last_offset is None else self.last_offset + page_size
+
+    def complete_page(self, offset):
+        self.last_offset = offset
+        self.save(update_fields=["last_offset", "updated_at"])
+
+    def mark_processed(self, ids):
+        """Appends ``ids`` in the database without rewriting the whole array."""
+        ids = list(ids)
+        if not ids:
+            return
+        type(self).objects.filter(pk=self.pk).update(
+            processed_ids=Func(
+                F("processed_ids"),
+                Value(ids, output_field=ArrayField(models.CharField(max_length=20))),
+                function="array_cat",
+            )
+        )
+        self.processed_ids = self.processed_ids + ids
+
+    def mark_running(self):
+        self.finish(self.RUNNING)
+
+    def finish(self, status=COMPLETED):
+        self.status = status
+        self.save(update_fields=["status", "updated_at"])
+
+    def __str__(self):
+        return f"{self.job} ({self.status}, offset {self.last_offset})"
@@ -0,0 +1,126 @@
+"""
+Keyset (cursor) pagination and cheap row counts.
+
+Instead of ``OFFSET n`` a page continues strictly after the sort key of the
+previous page's last row, so every page costs one index range scan of
+``size`` rows however deep the reader scrolls. The position travels as an
+opaque URL-safe cursor.
+
+    page = keyset_page(bills, [("latest_action_date", True), ("id", True)], cursor, 12)
+    page.items, page.next_cursor
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import F, Q
+
+# Below this planner estimate the exact count is cheap enough to run.
+EXACT_COUNT_THRESHOLD = 1000
+
+
+@dataclass
+class CursorPage:
+    items: list
+    next_cursor: str | None = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(values):
+    data = json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, length):
+    """Sort key values from ``cursor``, or None if it is missing or invalid."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    return values
+
+
+def canonical_cursor(cursor, length):
+    """``cursor`` re-encoded, or "" if it is missing or invalid.
+
+    Cache keys use this form so arbitrary client-supplied strings all map
+    to the first page instead of each adding an entry.
+    """
+    values = decode_cursor(cursor, length)
+    return "" if values is None else encode_cursor(values)
+
+
+def _order(field, descending):
+    # NULLs always sort last, which _after relies on.
+    return F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_last=True)
+
+
+def _after(keys, values):
+    """Rows sorting strictly after ``values`` under ``keys``."""
+    branches = []
+    tied = Q()
+    for (field, descending), value in zip(keys, values):
+        if value is None:
+            # Nothing non-null sorts after a NULL; only ties continue.
+            tied &= Q(**{f"{field}__isnull": True})
+            continue
+        beyond = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+        branches.append(tied & (beyond | Q(**{f"{field}__isnull": True})))
+        tied &= Q(**{field: value})
+    return reduce(or_, branches) if branches else Q(pk__in=[])
+
+
+def keyset_page(queryset, keys, cursor, size):
+    """One page of a ``values()`` queryset ordered by ``keys``.
+
+    ``keys`` is a sequence of ``(field, descending)`` pairs whose last
+    field is unique (normally the primary key), and every field must be in
+    the selected values.
+    """
+    queryset = queryset.order_by(*(_order(field, descending) for field, descending in keys))
+    after = decode_cursor(cursor, len(keys))
+    if after is not None:
+        queryset = queryset.filter(_after(keys, after))
+
+    rows = list(queryset[: size + 1])
+    if len(rows) <= size:
+        return CursorPage(rows)
+    rows = rows[:size]
+    return CursorPage(rows, encode_cursor([rows[-1][field] for field, _ in keys]))
+
+
+def approximate_count(queryset):
+    """Row count from the planner's table statistics.
+
+    Small results (by estimate) are counted exactly; large ones are not
+    worth a full scan for an "about N results" label.
+    """
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < EXACT_COUNT_THRESHOLD:
+        return queryset.count()
+    return estimate
@@ -0,0 +1,233 @@
+"""
+Distributed token-bucket rate limiting for upstream APIs.
+
+Buckets live in Redis so every thread, management command and Celery worker
+draws from the same quota. Limits are configured in ``settings.RATE_LIMITS``:
+
+    RATE_LIMITS = {
+        "congress": {"rate": 5000, "period": 3600, "burst": 250},
+    }
+
+    get_bucket("congress").acquire()      # blocks until a token is available
+
+Quotas that reset once per calendar day (Gemini RPD) are tracked separately
+by :class:`DailyBudget`, configured in ``settings.DAILY_BUDGETS``.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "repcheck:ratelimit"
+
+# Refill the bucket from elapsed time, then take the tokens if there are
+# enough. Returns the number of seconds the caller must wait (0 on success).
+# Uses the Redis server clock so workers on different hosts agree on time.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a token cannot be acquired within the caller's timeout."""
+
+
+class TokenBucket:
+    def __init__(self, name, rate, period, burst=None):
+        self.name = name
+        self.rate = rate / period  # tokens per second
+        self.capacity = burst or rate
+        self.key = f"{KEY_PREFIX}:{name}"
+        self._script = None
+        # Process-local fallback used only while Redis is unreachable.
+        self._local_tokens = float(self.capacity)
+        self._local_ts = time.monotonic()
+        self._local_lock = threading.Lock()
+
+    def try_acquire(self, tokens=1):
+        """Take ``tokens`` if available; otherwise return seconds to wait."""
+        if tokens > self.capacity:
+            raise ValueError(
+                f"Requested {tokens} tokens from {self.name}, capacity is {self.capacity}"
+            )
+        try:
+            if self._script is None:
+                self._script = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+            return float(self._script(keys=[self.key], args=[self.capacity, self.rate, tokens]))
+        except RedisError as e:
+            logger.warning(f"Rate limiter {self.name} falling back to local bucket: {e}")
+            return self._try_acquire_local(tokens)
+
+    def _try_acquire_local(self, tokens):
+        with self._local_lock:
+            now = time.monotonic()
+            self._local_tokens = min(
+                self.capacity, self._local_tokens + (now - self._local_ts) * self.rate
+            )
+            self._local_ts = now
+            if self._local_tokens >= tokens:
+                self._local_tokens -= tokens
+                return 0.0
+            return (tokens - self._local_tokens) / self.rate
+
+    def acquire(self, tokens=1, timeout=None):
+        """Block until ``tokens`` are available."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(f"{self.name}: would wait {wait:.1f}s")
+            if wait > 5:
+                logger.info(f"🚦 {self.name} rate limit reached, waiting {wait:.1f}s")
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1, timeout=None):
+        """Asyncio variant of :meth:`acquire`."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, tokens)
+            if wait <= 0:
+                return
+            if deadline is not None and loop.time() + wait > deadline:
+                raise RateLimitExceeded(f"{self.name}: would wait {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the upstream reports a 429 anyway."""
+        try:
+            seconds, microseconds = get_redis().time()
+            get_redis().hset(
+                self.key, mapping={"tokens": 0, "ts": seconds + microseconds / 1_000_000}
+            )
+        except RedisError:
+            with self._local_lock:
+                self._local_tokens = 0
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(name):
+    """Return the configured bucket for an upstream, e.g. ``"congress"``."""
+    bucket = _buckets.get(name)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(name)
+            if bucket is None:
+                bucket = TokenBucket(name, **settings.RATE_LIMITS[name])
+                _buckets[name] = bucket
+    return bucket
+
+
+class BudgetExhausted(RateLimitExceeded):
+    """Raised when a daily budget is spent; ``retry_after`` is the number of
+    seconds until it resets."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DailyBudget:
+    """Calendar-day request quota (e.g. Gemini RPD, which resets at midnight
+    Pacific), counted in Redis so every worker sees the same total."""
+
+    def __init__(self, name, limit, timezone="UTC"):
+        self.name = name
+        self.limit = limit
+        self.tz = ZoneInfo(timezone)
+
+    def _today(self):
+        return datetime.now(self.tz)
+
+    def _key(self):
+        return f"{KEY_PREFIX}:daily:{self.name}:{self._today():%Y-%m-%d}"
+
+    def seconds_until_reset(self):
+        now = self._today()
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return max(1, int((midnight - now).total_seconds()))
+
+    def used(self):
+        try:
+            return int(get_redis().get(self._key()) or 0)
+        except RedisError:
+            return 0
+
+    def remaining(self):
+        return max(0, self.limit - self.used())
+
+    def consume(self, amount=1):
+        """Counts ``amount`` against today's budget, or raises BudgetExhausted."""
+        key = self._key()
+        try:
+            pipe = get_redis().pipeline()
+            pipe.incrby(key, amount)
+            pipe.expire(key, 60 * 60 * 48)
+            used, _ = pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Daily budget {self.name} not tracked, Redis unavailable: {e}")
+            return
+        if used > self.limit:
+            get_redis().decrby(key, amount)
+            raise BudgetExhausted(
+                f"{self.name} daily budget of {self.limit} spent",
+                retry_after=self.seconds_until_reset(),
+            )
+
+
+def get_daily_budget(name):
+    return DailyBudget(name, **settings.DAILY_BUDGETS[name])
+
+
+def throttle_gemini(estimated_tokens=0):
+    """Wait for a Gemini request slot under the shared RPM and TPM buckets and
+    count it against the daily request budget.
+
+    Raises BudgetExhausted once the day's requests are spent, so callers can
+    defer the work instead of blocking until midnight.
+    """
+    get_daily_budget("gemini").consume()
+    get_bucket("gemini_rpm").acquire()
+    if estimated_tokens:
+        tpm = get_bucket("gemini_tpm")
+        tpm.acquire(min(estimated_tokens, tpm.capacity))
+
+
+def is_rate_limit_error(error):
+    return "429" in str(error) or "RESOURCE_EXHAUSTED" in str(error)
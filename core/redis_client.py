@@ -0,0 +1,20 @@
+import threading
+
+import redis
+from django.conf import settings
+
+_connection = None
+_lock = threading.Lock()
+
+
+def get_redis():
+    """Return a process-wide Redis connection for coordination primitives
+    (rate limits, locks) that live outside the Django cache API."""
+    global _connection
+    if _connection is None:
+        with _lock:
+            if _connection is None:
+                _connection = redis.Redis.from_url(
+                    settings.REDIS_URL, socket_timeout=5, socket_connect_timeout=5
+                )
+    return _connection
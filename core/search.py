@@ -0,0 +1,153 @@
+"""
+Ranked search across members, congresses and bills.
+
+The three entity searches run at the same time, each returns at most enough
+rows to fill the requested page, and the hits are merged by a normalized
+rank (0..1) so a strong bill match can outrank a weak member match. Every
+(normalized query, page) result is cached until ingestion writes (see
+``core.invalidation``).
+
+    results = search("pelosi", page=1)
+    results["hits"], results["has_next"]
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import close_old_connections
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from congress.models import Congress, Member, Membership
+from core.cache_keys import bump_namespace, make_key, normalize
+from core.swr import get_or_refresh
+from legislation.models import Bills
+
+# Must match the configuration used by the search_vector triggers.
+SEARCH_CONFIG = "english"
+PAGE_SIZE = 12
+MAX_PAGES = 20
+FRESH_FOR = 60 * 60
+CACHE_TIMEOUT = 60 * 60 * 24
+CACHE_NAMESPACE = "search"
+# ts_rank normalization: 1 divides by 1 + log(document length) so long bill
+# summaries do not drown out short names, 32 maps the score into 0..1.
+RANK_NORMALIZATION = 1 | 32
+CONGRESS_PATTERN = re.compile(r"^(?:congress\s*)?(\d{1,3})(?:st|nd|rd|th)?(?:\s*congress)?$")
+
+_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="search")
+
+
+def invalidate_search():
+    """Orphans every cached search page; called after ingestion writes."""
+    bump_namespace(CACHE_NAMESPACE)
+
+
+def _rank(search_query):
+    return SearchRank(F("search_vector"), search_query, normalization=Value(RANK_NORMALIZATION))
+
+
+def search_members(query, limit):
+    search_query = SearchQuery(query, config=SEARCH_CONFIG)
+    latest_membership = Membership.objects.filter(member=OuterRef("pk")).order_by(
+        "-congress__congress_number", "-start_year"
+    )
+    members = (
+        Member.objects.filter(search_vector=search_query)
+        .annotate(
+            rank=_rank(search_query),
+            party=Coalesce(Subquery(latest_membership.values("party")[:1]), Value("N/A")),
+            district=Subquery(latest_membership.values("district")[:1]),
+        )
+        .defer("search_vector")
+        .order_by("-rank", "name")[:limit]
+    )
+    return [
+        {
+            "kind": "member",
+            "rank": member.rank,
+            "pk": member.pk,
+            "title": member.full_name(),
+            "full_name": member.full_name(),
+            "state": member.state,
+            "party": member.party,
+            "district": member.district,
+            "image_url": member.image_url,
+        }
+        for member in members
+    ]
+
+
+def search_congresses(query, limit):
+    """Matches "118", "118th" or "118th congress" exactly on the number."""
+    match = CONGRESS_PATTERN.match(query)
+    if not match:
+        return []
+    return [
+        {
+            "kind": "congress",
+            "rank": 1.0,
+            "pk": congress.pk,
+            "title": f"Congress {congress.congress_number}",
+            "snippet": f"Congress {congress.congress_number} ({congress.start_date.year})",
+        }
+        for congress in Congress.objects.filter(congress_number=int(match.group(1)))[:limit]
+    ]
+
+
+def search_bills(query, limit):
+    search_query = SearchQuery(query, config=SEARCH_CONFIG)
+    bills = (
+        Bills.objects.filter(search_vector=search_query)
+        .annotate(rank=_rank(search_query), congress_number=F("congress__congress_number"))
+        .order_by("-rank", "-latest_action_date")
+        .values(
+            "rank", "pk", "title", "type", "number", "originChamber", "url",
+            "gemini_summary", "congress_number",
+        )[:limit]
+    )
+    return [{**bill, "kind": "bill", "congress": bill["congress_number"]} for bill in bills]
+
+
+def _run(search_fn, query, limit):
+    try:
+        return search_fn(query, limit)
+    finally:
+        close_old_connections()
+
+
+def run_search(query, page):
+    """Runs the entity searches concurrently and returns one merged page."""
+    # Enough hits from each type to fill this page whichever type wins,
+    # plus one to tell whether another page exists.
+    limit = page * PAGE_SIZE + 1
+    futures = [
+        _executor.submit(_run, search_fn, query, limit)
+        for search_fn in (search_members, search_congresses, search_bills)
+    ]
+    hits = [hit for future in futures for hit in future.result()]
+    hits.sort(key=lambda hit: hit["rank"], reverse=True)
+
+    start = (page - 1) * PAGE_SIZE
+    return {
+        "hits": hits[start:start + PAGE_SIZE],
+        "page": page,
+        "has_previous": page > 1,
+        "has_next": len(hits) > start + PAGE_SIZE and page < MAX_PAGES,
+    }
+
+
+def search(query, page=1):
+    """Cached, merged search results for ``query``."""
+    query = normalize(query)
+    page = min(max(page, 1), MAX_PAGES)
+    if not query:
+        return {"hits": [], "page": 1, "has_previous": False, "has_next": False}
+
+    return get_or_refresh(
+        make_key(CACHE_NAMESPACE, query=query, page=page),
+        lambda: run_search(query, page),
+        FRESH_FOR,
+        timeout=CACHE_TIMEOUT,
+    )
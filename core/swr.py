@@ -0,0 +1,145 @@
+"""
+Stale-while-revalidate caching with stampede protection.
+
+Values are stored with a soft expiry (``fresh_for``) well inside their cache
+timeout. Once a value is stale, the first request to take its refresh lock
+recomputes it on a background thread while every request, that one
+included, is answered from the stale copy. Values are also refreshed early
+with a probability that rises as the soft expiry nears and with how long the
+last computation took (XFetch), so busy keys are usually replaced before
+anyone sees them stale.
+
+A cold miss takes the same lock: the holder computes and the other requests
+wait up to ``COLD_WAIT`` seconds for its result instead of running the same
+query. Exceptions listed in ``errors`` (upstream failures) are cached for
+``error_timeout`` seconds and re-raised, so an outage is not retried by
+every request; if a good value exists it keeps being served instead.
+
+    content = get_or_refresh(
+        make_key(bill_namespace(congress, bill_type, number), view="details"),
+        lambda: render_modal(congress, bill_type, number),
+        fresh_for=60 * 60 * 24,
+        errors=(CongressApiError,),
+    )
+"""
+
+import logging
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60 * 60 * 24 * 7
+ERROR_TIMEOUT = 60
+# Longest a refresh may hold its lock before another request may retry.
+LOCK_TIMEOUT = 30
+COLD_WAIT = 5
+POLL_INTERVAL = 0.05
+# XFetch beta; above 1 refreshes earlier, 0 disables early refresh.
+EARLY_REFRESH_BETA = 1.0
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="swr")
+
+
+@dataclass
+class Entry:
+    value: object
+    fresh_until: float
+    # Seconds the computation took, which scales the early refresh window.
+    cost: float = 0.0
+    error: Exception | None = None
+
+
+def _lock_key(key):
+    return f"{key}:refresh"
+
+
+def _is_fresh(entry, beta=EARLY_REFRESH_BETA):
+    early = entry.cost * beta * -math.log(1.0 - random.random())
+    return time.time() + early < entry.fresh_until
+
+
+def _compute(key, compute, fresh_for, timeout, errors, error_timeout):
+    started = time.monotonic()
+    try:
+        value = compute()
+    except errors as e:
+        logger.warning(f"Caching failure of {key} for {error_timeout}s: {e}")
+        previous = cache.get(key)
+        if previous is not None and previous.error is None:
+            # Keep serving the last good value through the outage.
+            previous.fresh_until = time.time() + error_timeout
+            cache.set(key, previous, timeout)
+            return previous
+        entry = Entry(None, time.time() + error_timeout, error=e)
+        cache.set(key, entry, error_timeout)
+        return entry
+
+    entry = Entry(value, time.time() + fresh_for, time.monotonic() - started)
+    cache.set(key, entry, timeout)
+    return entry
+
+
+def _refresh(key, compute, options):
+    try:
+        _compute(key, compute, **options)
+    except Exception:
+        logger.exception(f"Background refresh of {key} failed")
+    finally:
+        cache.delete(_lock_key(key))
+        close_old_connections()
+
+
+def _compute_cold(key, compute, options):
+    if cache.add(_lock_key(key), True, LOCK_TIMEOUT):
+        try:
+            return _compute(key, compute, **options)
+        finally:
+            cache.delete(_lock_key(key))
+
+    deadline = time.monotonic() + COLD_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    # The lock holder is slow or gone; do not keep the request waiting.
+    return _compute(key, compute, **options)
+
+
+def get_or_refresh(
+    key,
+    compute,
+    fresh_for,
+    timeout=DEFAULT_TIMEOUT,
+    errors=(),
+    error_timeout=ERROR_TIMEOUT,
+    beta=EARLY_REFRESH_BETA,
+):
+    """The cached value of ``key``, calling ``compute()`` as described above.
+
+    ``fresh_for`` is the soft expiry and ``timeout`` how long a stale value
+    may still be served, both in seconds.
+    """
+    options = {
+        "fresh_for": fresh_for,
+        "timeout": timeout,
+        "errors": errors,
+        "error_timeout": error_timeout,
+    }
+    entry = cache.get(key)
+    if entry is None:
+        entry = _compute_cold(key, compute, options)
+    elif not _is_fresh(entry, beta) and cache.add(_lock_key(key), True, LOCK_TIMEOUT):
+        _executor.submit(_refresh, key, compute, options)
+
+    if entry.error is not None:
+        raise entry.error
+    return entry.value
+
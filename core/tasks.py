@@ -1,27 +1,45 @@
 from celery import shared_task
-import requests
-import httpx
-import os
-import json
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
 from .models import DailyCongressRecord
+from .congress_api import get_client
+from .gemini import summarize_pdf
+from .home import build_home_snapshot
 
 
-load_dotenv()
 GEMINI_MODEL = "gemini-2.5-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-API_KEY = os.getenv("CONGRESS_API_KEY")
-BASE_URL = "https://api.congress.gov/v3"
+DIGEST_PROMPT = "Summarize the daily congressional digest in plain (high school level) language. Do not use technical jargon. The summary should be concise and easy to understand."
+DIGEST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {
+            "type": "string",
+            "description": "A short summary of the legislation.",
+        },
+        "date": {
+            "type": "string",
+            "description": "The date of the congressional record.",
+        },
+    },
+}
+
+
+@shared_task(name="core.tasks.refresh_home_snapshot")
+def refresh_home_snapshot():
+    snapshot = build_home_snapshot()
+    return f"Home snapshot rebuilt with {len(snapshot['bills'])} bills"
+
+
+# Registered under its original name so existing beat entries keep working.
+@shared_task(name="core.views.update_bills_cache")
+def update_bills_cache(force_update=False):
+    """Rebuilds the home page snapshot from the local bills table, which
+    the bill ingestion task keeps current."""
+    return refresh_home_snapshot()
 
 
 @shared_task
 def fetch_daily_congress_record():
-    url = (
-        f"{BASE_URL}/daily-congressional-record/?limit=1&api_key={API_KEY}&format=json"
-    )
-    response = requests.get(url)
+    client = get_client()
+    response = client.request("daily-congressional-record", params={"limit": 1})
     if response.status_code == 200:
         print("Successfully fetched most recent congressional record date")
         data = response.json()
@@ -38,44 +56,18 @@ def fetch_daily_congress_record():
                 print(f"Record for {cleaned_date} already exists in the database.")
                 return
             elif not existing_record:
-                url = f"{BASE_URL}/congressional-record/?y={year}&m={month}&d={day}&api_key={API_KEY}&format=json"
-                second_response = requests.get(url)
+                second_response = client.request(
+                    "congressional-record", params={"y": year, "m": month, "d": day}
+                )
                 if second_response.status_code == 200:
                     data = second_response.json()
                     if data:
                         record_url = data["Results"]["Issues"][0]["Links"]["Digest"]["PDF"][0]["Url"]
                         try:
-                            doc_data = httpx.get(record_url).content
-                            prompt = "Summarize the daily congressional digest in plain (high school level) language. Do not use technical jargon. The summary should be concise and easy to understand."
-
-                            client = genai.Client(api_key=GEMINI_API_KEY)
                             print("Generating summary using Gemini API...")
-                            response = client.models.generate_content(
-                                model=GEMINI_MODEL,
-                                contents=[
-                                    types.Part.from_bytes(
-                                        data=doc_data, mime_type="application/pdf"
-                                    ),
-                                    prompt,
-                                ],
-                                config={
-                                    "response_mime_type": "application/json",
-                                    "response_schema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "summary": {
-                                                "type": "string",
-                                                "description": "A short summary of the legislation.",
-                                            },
-                                            "date": {
-                                                "type": "string",
-                                                "description": "The date of the congressional record.",
-                                            },
-                                        },
-                                    },
-                                },
+                            data = summarize_pdf(
+                                record_url, DIGEST_PROMPT, DIGEST_SCHEMA, GEMINI_MODEL
                             )
-                            data = json.loads(response.text)
                             summary = data.get("summary", "No summary available")
                             print(f"Summary: {summary}")
                             url = record_url
@@ -85,6 +77,7 @@ def fetch_daily_congress_record():
                                 summary=summary,
                                 pdf_url=url
                             )
+                            build_home_snapshot()
                         except Exception as e:
                             print(f"Error generating summary: {e}")
                             url = "fubar"
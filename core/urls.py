@@ -4,4 +4,5 @@ from .views import *
 urlpatterns = [
    path("", home, name="landing_page"),
    path("search/", search_page, name="search_page"),
+   path("search/typeahead/", typeahead, name="typeahead"),
 ]
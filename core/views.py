@@ -2,21 +2,16 @@ from django.shortcuts import render
 from django.core.cache import cache
 from google import genai
 from google.genai import types
-from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
+from django.contrib.postgres.search import TrigramWordSimilarity
 from dotenv import load_dotenv
-from celery import shared_task
-import requests
 import os
-import hashlib
-import json
-from .models import DailyCongressRecord
-from congress.models import Member, Congress, Membership
+from .home import get_home_snapshot
+from .cache_keys import make_key
+from .search import search
+from congress.models import Member
 from legislation.models import Bills
 from django.shortcuts import render, get_object_or_404
 from django.views.decorators.cache import cache_page
-import requests
-import os
-from dotenv import load_dotenv
 import time
 
 
@@ -25,131 +20,65 @@ GEMINI_MODEL = "gemini-2.5-flash"
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 # Create your views here.
 
-API_KEY = os.getenv("CONGRESS_API_KEY")
-BASE_URL = "https://api.congress.gov/v3"
 CACHE_TIMEOUT = 60 * 15  # 10 minutes
-
-
-@shared_task
-def update_bills_cache(force_update=False):
-    url = f"{BASE_URL}/bill?api_key={API_KEY}&limit=12"
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        bills = response.json().get("bills", [])
-        current_hash = hashlib.md5(
-            json.dumps(bills, sort_keys=True).encode()
-        ).hexdigest()
-
-        cached_hash = cache.get("bills_hash")
-
-        if force_update or current_hash != cached_hash:
-            print("Cache updated with new bills data")
-            cache.set("bills_data", bills, timeout=None)
-            cache.set("bills_hash", current_hash, timeout=None)
-            return "Cache updated"
-        return "No changes"
-
-    return f"API Error: {response.status_code}"
+TYPEAHEAD_LIMIT = 8
+TYPEAHEAD_MIN_LENGTH = 2
+TYPEAHEAD_CACHE_TIMEOUT = 60 * 10
 
 
 def home(request):
-    url = f"{BASE_URL}/bill?api_key={API_KEY}&limit=12"
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            bills = response.json().get("bills", [])
-        else:
-            bills = []
-    except requests.RequestException:
-        bills = []
-    today = DailyCongressRecord.objects.order_by("-issue_date").first()
-    summary = today.summary if today else "No summary available for today."
-    print(f"Today's summary: {summary}")
-    pdf_url = today.pdf_url
+    snapshot = get_home_snapshot()
     return render(
-        request, "core/home.html", {"bills": bills, "summary": summary, "url": pdf_url}
+        request,
+        "core/home.html",
+        {
+            "bills": snapshot["bills"],
+            "summary": snapshot["summary"] or "No summary available for today.",
+            "url": snapshot["url"],
+            "counts": snapshot["counts"],
+            "congress_number": snapshot["congress_number"],
+        },
     )
 
 
 def search_page(request):
     query = request.GET.get("q", "").strip()
-    results = []
-
-    if query:
-        search_query = SearchQuery(query)
-
-        # Search members directly
-        members = (
-            Member.objects.annotate(
-                search=SearchVector("name", "state"),
-                rank=SearchRank(SearchVector("name", "state"), search_query),
-            )
-            .filter(search=search_query)
-            .order_by("-rank")
-        )
-
-        # Add to results list with type info
-        for member in members:
-            results.append(
-                {
-                    "object": member,
-                    "kind": "member",
-                    "title": member.full_name(),
-                    "pk": member.pk,
-                    "snippet": f"{member.full_name()} ({member.state})",
-                    "state": member.state,
-                    "party": Membership.objects.filter(member=member).last().party if Membership.objects.filter(member=member).exists() else "N/A",
-                    "district": Membership.objects.filter(member=member).last().district if Membership.objects.filter(member=member).exists() else "N/A",
-                    "image_url": member.image_url,
-                    "full_name": member.full_name(),
-                }
-            )
-
-        # Search congress sessions
-        congresses = (
-            Congress.objects.annotate(
-                search=SearchVector("congress_number"),
-                rank=SearchRank(SearchVector("congress_number"), search_query),
-            )
-            .filter(search=search_query)
-            .order_by("-rank")[:10]
-        )
-
-        for congress in congresses:
-            results.append(
-                {
-                    "object": congress,
-                    "kind": "congress",
-                    "title": f"Congress {congress.congress_number}",
-                    "snippet": f"Congress {congress.congress_number} ({congress.start_date.year})",
-                }
-            )
-        # Search bills
-        bills = (
-            Bills.objects.annotate(
-                search=SearchVector("title", "gemini_summary", "type", "number", "tags"),
-                rank=SearchRank(SearchVector("title", "gemini_summary", "type", "number", "tags"), search_query),
-            )
-            .filter(search=search_query)
-            .order_by("-rank")
-        )
-        
-        for bill in bills:
-            results.append(
-                {
-                    "object": bill,
-                    "kind": "bill",
-                    "title": bill.title,
-                    "snippet": f"{bill.number}: {bill.gemini_summary}...",
-                    "gemini_summary": bill.gemini_summary,
-                    "number": bill.number,
-                    "congress": bill.congress_id,
-                    "type": bill.type,
-                    "url": bill.url,
-                }
-            )
-        
-    print(f"Search results for {results}")
-    return render(request, "core/search.html", {"query": query, "results": results})
-
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        page = 1
+    results = search(query, page)
+    return render(request, "core/search.html", {"query": query, **results})
+
+
+def typeahead(request):
+    """As-you-type suggestions for the search box.
+
+    Matches are typo and prefix tolerant (``pg_trgm`` word similarity, served
+    by the trigram GIN indexes on ``Member.name`` and ``Bills.title``), and
+    each normalized query is cached so repeated keystrokes skip the database.
+    """
+    query = " ".join(request.GET.get("q", "").split()).lower()
+    suggestions = {"members": [], "bills": []}
+
+    if len(query) >= TYPEAHEAD_MIN_LENGTH:
+        cache_key = make_key("typeahead", query=query)
+        suggestions = cache.get(cache_key)
+        if suggestions is None:
+            suggestions = {
+                "members": list(
+                    Member.objects.filter(name__trigram_word_similar=query)
+                    .annotate(similarity=TrigramWordSimilarity(query, "name"))
+                    .order_by("-similarity")
+                    .values("pk", "name", "state")[:TYPEAHEAD_LIMIT]
+                ),
+                "bills": list(
+                    Bills.objects.filter(title__trigram_word_similar=query)
+                    .annotate(similarity=TrigramWordSimilarity(query, "title"))
+                    .order_by("-similarity")
+                    .values("pk", "type", "number", "title", "url")[:TYPEAHEAD_LIMIT]
+                ),
+            }
+            cache.set(cache_key, suggestions, TYPEAHEAD_CACHE_TIMEOUT)
+
+    return render(request, "core/partials/typeahead.html", {"query": query, **suggestions})
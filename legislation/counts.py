@@ -0,0 +1,65 @@
+"""
+Per-congress sponsorship counts of each Membership, aggregated from the
+locally stored ``BillSponsorship`` rows instead of paging through every
+member's sponsored and cosponsored legislation on Congress.gov.
+
+A single UPDATE recomputes the counts of any set of memberships; bill
+ingestion refreshes just the members a bill names (see
+``legislation.detail``). Only congresses whose bill details have been fully
+backfilled (``Congress.bill_details_synced_at``) are recounted, since a
+partial set of stored bills would undercount; the other memberships keep
+their counts.
+"""
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from congress.models import Member, Membership
+
+from .models import BillSponsorship
+
+
+def _count(role):
+    sponsorships = (
+        BillSponsorship.objects.filter(
+            member_id=OuterRef("member_id"),
+            bill__congress_id=OuterRef("congress_id"),
+            role=role,
+            withdrawn_date__isnull=True,
+        )
+        .order_by()
+        .values("member_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(sponsorships, output_field=IntegerField()), Value(0))
+
+
+def link_sponsorships(member_ids=None):
+    """Points sponsorships stored before their member existed at the member."""
+    unlinked = BillSponsorship.objects.filter(member__isnull=True)
+    if member_ids is not None:
+        unlinked = unlinked.filter(
+            bioguide_id__in=Member.objects.filter(pk__in=member_ids).values("bioguide_id")
+        )
+    member = Member.objects.filter(bioguide_id=OuterRef("bioguide_id")).values("pk")
+    return unlinked.update(member_id=Subquery(member[:1]))
+
+
+def refresh_sponsorship_counts(member_ids=None, congress_ids=None):
+    """Recounts the memberships of ``member_ids`` in ``congress_ids`` (every
+    one if None) within the backfilled congresses and returns the number of
+    memberships updated."""
+    memberships = Membership.objects.filter(congress__bill_details_synced_at__isnull=False)
+    if member_ids is not None:
+        member_ids = list(member_ids)
+        link_sponsorships(member_ids)
+        memberships = memberships.filter(member_id__in=member_ids)
+    else:
+        link_sponsorships()
+    if congress_ids is not None:
+        memberships = memberships.filter(congress_id__in=list(congress_ids))
+    return memberships.update(
+        sponsored_legislation_count=_count(BillSponsorship.SPONSOR),
+        cosponsored_legislation_count=_count(BillSponsorship.COSPONSOR),
+    )
@@ -0,0 +1,149 @@
+"""
+Stores a bill's full detail graph locally so the bill modal never calls
+Congress.gov.
+
+``sync_bill_detail`` fetches the bill with its actions, cosponsors and
+amendments and replaces the bill's child rows in one transaction, so a
+modal never shows a half-written bill. The sponsorship counts of the
+members named before and after are recounted in the same transaction.
+
+    sync_bill_detail(get_client().get("bill/119/hr/1")["bill"])
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from congress.models import Member
+from core.congress_api import get_client
+from core.invalidation import notify_changed
+
+from .counts import refresh_sponsorship_counts
+from .models import BillAction, BillAmendment, BillLaw, Bills, BillSponsorship
+from .tasks import bill_defaults, bill_key, get_congress
+
+
+class BillDetailsPending(Exception):
+    """The bill's detail graph has not been stored yet."""
+
+
+def bill_path(congress_number, bill_type, number):
+    return f"bill/{congress_number}/{str(bill_type).lower()}/{number}"
+
+
+def fetch_bill_detail(congress_number, bill_type, number):
+    """The Congress.gov bill record; raises CongressApiError."""
+    return get_client().get(bill_path(congress_number, bill_type, number))["bill"]
+
+
+def _district(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def sponsorship(bill, role, person, member_ids):
+    return BillSponsorship(
+        bill=bill,
+        member_id=member_ids.get(person.get("bioguideId")),
+        role=role,
+        bioguide_id=person.get("bioguideId"),
+        full_name=person.get("fullName")
+        or f"{person.get('firstName', '')} {person.get('lastName', '')}".strip(),
+        party=person.get("party"),
+        state=person.get("state"),
+        district=_district(person.get("district")),
+        is_original_cosponsor=bool(person.get("isOriginalCosponsor")),
+        sponsorship_date=person.get("sponsorshipDate"),
+        withdrawn_date=person.get("sponsorshipWithdrawnDate"),
+    )
+
+
+def action(bill, item):
+    return BillAction(
+        bill=bill,
+        action_date=item.get("actionDate"),
+        action_code=item.get("actionCode"),
+        action_type=item.get("type"),
+        source=(item.get("sourceSystem") or {}).get("name"),
+        text=item.get("text") or "",
+    )
+
+
+def amendment(bill, item):
+    latest_action = item.get("latestAction") or {}
+    return BillAmendment(
+        bill=bill,
+        congress_number=item.get("congress"),
+        type=item.get("type"),
+        number=str(item.get("number")),
+        description=item.get("description"),
+        purpose=item.get("purpose"),
+        latest_action_date=latest_action.get("actionDate"),
+        latest_action=latest_action.get("text"),
+        url=item.get("url"),
+    )
+
+
+def detail_defaults(bill, congress_id):
+    """Bills column values of a Congress.gov bill detail record."""
+    return {
+        **bill_defaults(bill, congress_id),
+        "introduced_date": bill.get("introducedDate"),
+        "update_date": bill.get("updateDate"),
+        "policy_area": (bill.get("policyArea") or {}).get("name"),
+        "constitutional_authority": bill.get("constitutionalAuthorityStatementText"),
+        "cbo_cost_estimates": bill.get("cboCostEstimates") or [],
+        "detail_synced_at": timezone.now(),
+    }
+
+
+def sync_bill_detail(bill):
+    """Stores a bill detail record and its sponsorships, actions,
+    amendments and laws, fetching the paginated parts from Congress.gov.
+
+    Returns the Bills row. Raises CongressApiError before anything is
+    written if a part cannot be fetched.
+    """
+    path = bill_path(bill.get("congress"), bill.get("type"), bill.get("number"))
+    client = get_client()
+    actions = list(client.paginate(f"{path}/actions", "actions"))
+    cosponsors = list(client.paginate(f"{path}/cosponsors", "cosponsors"))
+    amendments = list(client.paginate(f"{path}/amendments", "amendments"))
+
+    sponsors = bill.get("sponsors") or []
+    bioguide_ids = {p.get("bioguideId") for p in sponsors + cosponsors}
+    member_ids = dict(
+        Member.objects.filter(bioguide_id__in=bioguide_ids).values_list("bioguide_id", "pk")
+    )
+
+    congress = get_congress(bill.get("congress"))
+    defaults = detail_defaults(bill, congress.id)
+    with transaction.atomic():
+        db_bill, _ = Bills.objects.update_or_create(
+            number=defaults["number"],
+            type=defaults["type"],
+            congress_id=congress.id,
+            defaults=defaults,
+        )
+        previous = BillSponsorship.objects.filter(bill=db_bill, member__isnull=False)
+        affected = set(previous.values_list("member_id", flat=True)) | set(member_ids.values())
+        for model in (BillSponsorship, BillAction, BillAmendment, BillLaw):
+            model.objects.filter(bill=db_bill).delete()
+
+        BillSponsorship.objects.bulk_create(
+            [sponsorship(db_bill, BillSponsorship.SPONSOR, p, member_ids) for p in sponsors]
+            + [sponsorship(db_bill, BillSponsorship.COSPONSOR, p, member_ids) for p in cosponsors],
+            ignore_conflicts=True,
+        )
+        BillAction.objects.bulk_create([action(db_bill, item) for item in actions])
+        BillAmendment.objects.bulk_create([amendment(db_bill, item) for item in amendments])
+        BillLaw.objects.bulk_create(
+            [
+                BillLaw(bill=db_bill, type=law.get("type"), number=law.get("number"))
+                for law in bill.get("laws") or []
+            ]
+        )
+        refresh_sponsorship_counts(affected, congress_ids=[congress.id])
+        notify_changed(bills=[bill_key(bill)], members=affected)
+    return db_bill
@@ -1,18 +1,10 @@
-from google import genai
-from google.genai import types
-import os
-import requests
-import json
 from django.core.management.base import BaseCommand
-from dotenv import load_dotenv
 from legislation.models import Bills
+from legislation.tasks import BILL_SUMMARY_PROMPT, BILL_SUMMARY_SCHEMA, GEMINI_MODEL
 from congress.models import Congress
-import httpx
-
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-API_KEY = os.getenv("CONGRESS_API_KEY")
-BASE_URL = "https://api.congress.gov/v3"
+from core.congress_api import CongressApiError, get_client
+from core.gemini import get_gemini_client, summarize_pdf
+from core.invalidation import notify_changed
 
 
 class Command(BaseCommand):
@@ -25,39 +17,24 @@ class Command(BaseCommand):
 
 def fetch_bills():
     bills = []
-    offset = 0
     limit = 12
     # This is where I will fetch the pdf for the bill?
     # url format: /bill/{congress}/{billType}/{billNumber}/text
     # textVersions > most recent entry is 0 >  type=PDF
-    while offset <= 24:
-        congress = Congress.get_current_congress_number()
-        url = f"{BASE_URL}/bill/{congress}/?api_key={API_KEY}&offset={offset}&limit={limit}"
-        response = requests.get(url)
-
-        if response.status_code != 200:
-            print(f"Error fetching data: {response.status_code}")
-            break
-        data = response.json()
-        pagination_info = data.get("pagination", {})
-        next_page = pagination_info.get("next")
-
-        if "bills" in data:
-            bills.extend(data["bills"])
+    congress = Congress.get_current_congress_number()
+    try:
+        for page in get_client().iter_pages(f"bill/{congress}", "bills", limit=limit):
+            bills.extend(page.items)
             print(f"Fetched {len(bills)} bills")
-        else:
-            print("No bills found in the response.")
-            break
-        if next_page:
-            offset += limit
-        else:
-            print("Finished fetching bills.")
-            break
+            if page.offset + limit > 24:
+                break
+    except CongressApiError as e:
+        print(f"Error fetching data: {e.status_code}")
     return bills
 
 
 def Process_with_Gemini(bills):
-    client = genai.Client(api_key=GEMINI_API_KEY)
+    client = get_gemini_client()
     if not bills:
         print("No bills to process.")
         return
@@ -86,8 +63,9 @@ def Process_with_Gemini(bills):
             }
 
             # Try to get Gemini data
-            text_versions_url = f"{BASE_URL}/bill/{congress}/{bill_type}/{number}/text?api_key={API_KEY}&format=json"
-            text_versions_response = requests.get(text_versions_url)
+            text_versions_response = get_client().request(
+                f"bill/{congress}/{bill_type}/{number}/text"
+            )
 
             if text_versions_response.status_code == 200:
                 text_versions_data = text_versions_response.json().get(
@@ -112,36 +90,13 @@ def Process_with_Gemini(bills):
                         try:
                             print(f"Processing Bill: {number} of Congress {congress}")
                             
-                            doc_data = httpx.get(full_text_url).content
-                            prompt = "Summarize this bill in high school level language, provide key changes and provisions. Also provide 3 tags under 25 characters each"
-                            response = client.models.generate_content(
-                                model="gemini-2.0-flash-lite",
-                                contents=[
-                                    types.Part.from_bytes(data=doc_data, mime_type="application/pdf"),
-                                    prompt,
-                                ],
-                                config={
-                                    "response_mime_type": "application/json",
-                                    "response_schema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "summary": {
-                                                "type": "string",
-                                                "description": "A short summary of the legislation.",
-                                            },
-                                            "tags": {
-                                                "type": "array",
-                                                "items": {
-                                                    "type": "string",
-                                                    "description": "A tag related to the legislation.",
-                                                },
-                                            },
-                                        },
-                                    },
-                                },
+                            data = summarize_pdf(
+                                full_text_url,
+                                BILL_SUMMARY_PROMPT,
+                                BILL_SUMMARY_SCHEMA,
+                                GEMINI_MODEL,
+                                client=client,
                             )
-                            # Gemini processing
-                            data = json.loads(response.text)
 
                             defaults["gemini_summary"] = data.get("summary")
                             defaults["tags"] = data.get("tags", [])
@@ -155,6 +110,7 @@ def Process_with_Gemini(bills):
             bill_obj, created = Bills.objects.update_or_create(
                 number=number, type=bill_type, defaults=defaults
             )
+            notify_changed(bills=[(congress, bill_type, number)])
             print(f"Successfully saved bill {number} (created: {created})")
 
         except Exception as e:
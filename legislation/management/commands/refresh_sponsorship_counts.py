@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from congress.models import Membership
+from core.invalidation import notify_changed
+from legislation.counts import refresh_sponsorship_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts sponsored and cosponsored legislation from the locally "
+        "stored bill sponsorships, for congresses whose bill details have "
+        "been backfilled with sync_legislation --details."
+    )
+
+    def handle(self, *args, **options):
+        updated = refresh_sponsorship_counts()
+        notify_changed(
+            members=Membership.objects.filter(
+                congress__bill_details_synced_at__isnull=False
+            ).values_list("member_id", flat=True)
+        )
+        print(f"✅ Refreshed sponsorship counts of {updated} memberships")
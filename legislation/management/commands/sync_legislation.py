@@ -0,0 +1,106 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from congress.models import Congress, Membership
+from core.invalidation import notify_changed
+from legislation.counts import refresh_sponsorship_counts
+from core.congress_api import CongressApiError, get_client
+from legislation.detail import fetch_bill_detail, sync_bill_detail
+from legislation.tasks import save_bill_metadata
+
+
+class Command(BaseCommand):
+    help = (
+        "Stores the bill (or law) listing of a congress in the local Bills table, "
+        "which is what the legislation pages are served from."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--congress",
+            type=int,
+            default=None,
+            help="Congress number (defaults to the current congress)",
+        )
+        parser.add_argument(
+            "--laws",
+            action="store_true",
+            help="Walk the law listing instead of every bill",
+        )
+        parser.add_argument(
+            "--details",
+            action="store_true",
+            help="Also store sponsors, cosponsors, actions and amendments "
+            "(several requests per bill); a complete run enables local "
+            "sponsorship counts for the congress",
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Walk the bill listing and then the law listing; if both "
+            "complete the congress is marked as backfilled",
+        )
+
+    def handle(self, *args, **options):
+        congress_number = options["congress"] or Congress.get_current_congress_number()
+        if options["backfill"]:
+            endpoints = ["bill", "law"]
+        else:
+            endpoints = ["law"] if options["laws"] else ["bill"]
+
+        complete = {
+            endpoint: self.walk(endpoint, congress_number, options["details"])
+            for endpoint in endpoints
+        }
+
+        if options["details"] and complete.get("bill"):
+            mark_details_backfilled(congress_number)
+        elif options["details"]:
+            print("Bill details incomplete; sponsorship counts left unchanged")
+
+        if options["backfill"] and all(complete.values()):
+            Congress.objects.filter(congress_number=congress_number).update(
+                bills_synced_at=timezone.now()
+            )
+            print(f"✅ Congress {congress_number} backfilled")
+
+    def walk(self, endpoint, congress_number, details):
+        """Stores one listing; True if every bill in it was saved."""
+        print(f"Syncing {endpoint} listing for congress {congress_number}")
+
+        saved = 0
+        failed = 0
+        completed = False
+        try:
+            for bill in get_client().paginate(f"{endpoint}/{congress_number}", "bills"):
+                try:
+                    if details:
+                        sync_bill_detail(
+                            fetch_bill_detail(bill["congress"], bill["type"], bill["number"])
+                        )
+                    else:
+                        save_bill_metadata(bill)
+                    saved += 1
+                except Exception as e:
+                    failed += 1
+                    print(f"❌ Error saving {bill.get('type')} {bill.get('number')}: {e}")
+                if saved and saved % 250 == 0:
+                    print(f"✅ Saved {saved} bills")
+            completed = True
+        except CongressApiError as e:
+            print(f"❌ Error fetching {endpoint} listing: {e}")
+
+        print(f"✅ Saved {saved} bills for congress {congress_number}")
+        return completed and not failed
+
+
+def mark_details_backfilled(congress_number):
+    """Flags the congress as fully stored and recounts its sponsorships."""
+    congress = Congress.objects.get(congress_number=congress_number)
+    with transaction.atomic():
+        Congress.objects.filter(pk=congress.pk).update(bill_details_synced_at=timezone.now())
+        updated = refresh_sponsorship_counts(congress_ids=[congress.pk])
+        notify_changed(
+            members=Membership.objects.filter(congress=congress).values_list("member_id", flat=True)
+        )
+    print(f"✅ Recounted sponsorships of {updated} memberships in congress {congress_number}")
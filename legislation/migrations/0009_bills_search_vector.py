@@ -0,0 +1,49 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Keeps legislation_bills.search_vector current so searches read the GIN
+# index instead of re-tokenizing gemini_summary for every row.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION legislation_bills_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.type, '') || ' ' || coalesce(NEW.number, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.gemini_summary, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER legislation_bills_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, type, number, tags, gemini_summary ON legislation_bills
+    FOR EACH ROW EXECUTE FUNCTION legislation_bills_search_vector_update();
+
+UPDATE legislation_bills SET title = title;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS legislation_bills_search_vector_trigger ON legislation_bills;
+DROP FUNCTION IF EXISTS legislation_bills_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('legislation', '0008_rename_bill_number_bills_number_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bills',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='bills',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='bills_search_vector_gin'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,18 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('legislation', '0009_bills_search_vector'),
+        # pg_trgm is installed there.
+        ('congress', '0015_member_name_trgm'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bills',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='bills_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('congress', '0016_rosterentry'),
+        ('legislation', '0010_bills_title_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bills',
+            name='law_number',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='bills',
+            name='law_type',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='bills',
+            index=models.Index(models.F('congress'), models.OrderBy(models.F('latest_action_date'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='bills_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bills',
+            index=models.Index(models.F('congress'), models.OrderBy(models.F('latest_action_date'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), condition=models.Q(('law_number__isnull', False)), name='laws_listing_idx'),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('congress', '0016_rosterentry'),
+        ('legislation', '0011_bills_laws_listing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bills',
+            name='cbo_cost_estimates',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='bills',
+            name='constitutional_authority',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bills',
+            name='detail_synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bills',
+            name='introduced_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bills',
+            name='policy_area',
+            field=models.CharField(blank=True, max_length=150, null=True),
+        ),
+        migrations.AddField(
+            model_name='bills',
+            name='update_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='BillAction',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('action_date', models.DateField(blank=True, null=True)),
+                ('action_code', models.CharField(blank=True, max_length=20, null=True)),
+                ('action_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('source', models.CharField(blank=True, max_length=100, null=True)),
+                ('text', models.TextField()),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='actions', to='legislation.bills')),
+            ],
+            options={
+                'ordering': ['-action_date', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BillAmendment',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('congress_number', models.IntegerField()),
+                ('type', models.CharField(max_length=10)),
+                ('number', models.CharField(max_length=20)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('purpose', models.TextField(blank=True, null=True)),
+                ('latest_action_date', models.DateField(blank=True, null=True)),
+                ('latest_action', models.TextField(blank=True, null=True)),
+                ('url', models.URLField(blank=True, max_length=150, null=True)),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='amendments', to='legislation.bills')),
+            ],
+            options={
+                'ordering': ['-latest_action_date', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BillLaw',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('type', models.CharField(max_length=20)),
+                ('number', models.CharField(max_length=20)),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='laws', to='legislation.bills')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BillSponsorship',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('role', models.CharField(choices=[('sponsor', 'Sponsor'), ('cosponsor', 'Cosponsor')], max_length=10)),
+                ('bioguide_id', models.CharField(max_length=20)),
+                ('full_name', models.CharField(max_length=255)),
+                ('party', models.CharField(blank=True, max_length=10, null=True)),
+                ('state', models.CharField(blank=True, max_length=10, null=True)),
+                ('district', models.IntegerField(blank=True, null=True)),
+                ('is_original_cosponsor', models.BooleanField(default=False)),
+                ('sponsorship_date', models.DateField(blank=True, null=True)),
+                ('withdrawn_date', models.DateField(blank=True, null=True)),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sponsorships', to='legislation.bills')),
+                ('member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sponsorships', to='congress.member')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['member', 'role'], name='sponsorship_member_idx')],
+                'constraints': [models.UniqueConstraint(fields=('bill', 'role', 'bioguide_id'), name='bill_sponsorship_unique')],
+            },
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
+from django.db.models import F, Q
 from django.contrib.postgres.fields import ArrayField
-from congress.models import Congress
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from congress.models import Congress, Member
 
 
 # Create your models here.
@@ -21,6 +24,122 @@ class Bills(models.Model):
     gemini_summary= models.CharField(max_length=10000, null=True)
     tags= ArrayField( models.CharField(max_length=25, blank=True), size=3, null=True)
     url= models.URLField(max_length=150, null=True)
-    
+    # Set once the bill is enacted, e.g. "119-21" / "Public Law".
+    law_number = models.CharField(max_length=20, null=True, blank=True)
+    law_type = models.CharField(max_length=20, null=True, blank=True)
+    # Bill detail, stored with its sponsorships, actions, amendments and laws
+    # by ``legislation.detail.sync_bill_detail``.
+    introduced_date = models.DateField(null=True, blank=True)
+    update_date = models.DateTimeField(null=True, blank=True)
+    policy_area = models.CharField(max_length=150, null=True, blank=True)
+    constitutional_authority = models.TextField(null=True, blank=True)
+    cbo_cost_estimates = models.JSONField(default=list, blank=True)
+    detail_synced_at = models.DateTimeField(null=True, blank=True)
+    # Maintained by a database trigger from title, type, number, tags and gemini_summary.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="bills_search_vector_gin"),
+            GinIndex(fields=["title"], name="bills_title_trgm", opclasses=["gin_trgm_ops"]),
+            # Listing order for bills and, partially, for laws.
+            models.Index(
+                "congress",
+                F("latest_action_date").desc(nulls_last=True),
+                F("id").desc(),
+                name="bills_listing_idx",
+            ),
+            models.Index(
+                "congress",
+                F("latest_action_date").desc(nulls_last=True),
+                F("id").desc(),
+                name="laws_listing_idx",
+                condition=Q(law_number__isnull=False),
+            ),
+        ]
+
     def __str__(self):
         return "Bills"
+
+
+class BillSponsorship(models.Model):
+    """A member's sponsorship or cosponsorship of a bill.
+
+    ``member`` is resolved by bioguide ID and left empty for members that are
+    not stored locally; the name and party are kept as listed on the bill.
+    """
+
+    SPONSOR = "sponsor"
+    COSPONSOR = "cosponsor"
+    ROLE_CHOICES = [(SPONSOR, "Sponsor"), (COSPONSOR, "Cosponsor")]
+
+    id = models.AutoField(primary_key=True)
+    bill = models.ForeignKey(Bills, on_delete=models.CASCADE, related_name="sponsorships")
+    member = models.ForeignKey(
+        Member, on_delete=models.SET_NULL, null=True, blank=True, related_name="sponsorships"
+    )
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    bioguide_id = models.CharField(max_length=20)
+    full_name = models.CharField(max_length=255)
+    party = models.CharField(max_length=10, null=True, blank=True)
+    state = models.CharField(max_length=10, null=True, blank=True)
+    district = models.IntegerField(null=True, blank=True)
+    is_original_cosponsor = models.BooleanField(default=False)
+    sponsorship_date = models.DateField(null=True, blank=True)
+    withdrawn_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bill", "role", "bioguide_id"], name="bill_sponsorship_unique"
+            )
+        ]
+        indexes = [models.Index(fields=["member", "role"], name="sponsorship_member_idx")]
+
+    def __str__(self):
+        return f"{self.full_name} ({self.role})"
+
+
+class BillAction(models.Model):
+    id = models.AutoField(primary_key=True)
+    bill = models.ForeignKey(Bills, on_delete=models.CASCADE, related_name="actions")
+    action_date = models.DateField(null=True, blank=True)
+    action_code = models.CharField(max_length=20, null=True, blank=True)
+    action_type = models.CharField(max_length=50, null=True, blank=True)
+    source = models.CharField(max_length=100, null=True, blank=True)
+    text = models.TextField()
+
+    class Meta:
+        ordering = ["-action_date", "-id"]
+
+    def __str__(self):
+        return f"{self.action_date}: {self.text[:50]}"
+
+
+class BillAmendment(models.Model):
+    id = models.AutoField(primary_key=True)
+    bill = models.ForeignKey(Bills, on_delete=models.CASCADE, related_name="amendments")
+    congress_number = models.IntegerField()
+    type = models.CharField(max_length=10)
+    number = models.CharField(max_length=20)
+    description = models.TextField(null=True, blank=True)
+    purpose = models.TextField(null=True, blank=True)
+    latest_action_date = models.DateField(null=True, blank=True)
+    latest_action = models.TextField(null=True, blank=True)
+    url = models.URLField(max_length=150, null=True, blank=True)
+
+    class Meta:
+        ordering = ["-latest_action_date", "-id"]
+
+    def __str__(self):
+        return f"{self.type} {self.number} ({self.congress_number})"
+
+
+class BillLaw(models.Model):
+    id = models.AutoField(primary_key=True)
+    bill = models.ForeignKey(Bills, on_delete=models.CASCADE, related_name="laws")
+    type = models.CharField(max_length=20)
+    number = models.CharField(max_length=20)
+
+    def __str__(self):
+        return f"{self.type} {self.number}"
@@ -1,38 +1,96 @@
-from celery import shared_task
-from celery.exceptions import Retry
-from google import genai
-from google.genai import types
-import os
-import requests
-import json
-import httpx
+from celery import group, shared_task
+from django.core.management import call_command
 import logging
-import time
-import urllib.parse
 from datetime import datetime, timedelta
 from .models import Bills
 from congress.models import Congress
+from core.congress_api import CongressApiError, get_client
+from core.gemini import (
+    RATE_LIMIT_RETRY_AFTER,
+    SummaryInProgress,
+    get_gemini_client,
+    summarize_pdf,
+)
+from core.locks import redis_lock
+from core.rate_limit import BudgetExhausted, RateLimitExceeded, get_daily_budget
+from core.redis_client import get_redis
+from core.invalidation import notify_changed
 
 logger = logging.getLogger(__name__)
+BILL_LOCK_TIMEOUT = 60 * 10
+RUN_LOCK_TIMEOUT = 60 * 14
+BACKFILL_LOCK_TIMEOUT = 60 * 60 * 6
+# Bills waiting for the Gemini daily budget to reset (see drain_deferred_bills).
+DEFERRED_BILLS_KEY = "repcheck:bills:deferred"
 GEMINI_MODEL = "gemini-2.5-flash-lite"
-GEMINI_RPM = 15
-GEMINI_RPD = 1000
-GEMINI_TPM = 1000000
+BILL_SUMMARY_PROMPT = "Summarize this bill in high school level language, provide key changes and provisions. Also provide 3 tags under 25 characters each"
+BILL_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {
+            "type": "string",
+            "description": "A short summary of the legislation.",
+        },
+        "tags": {
+            "type": "array",
+            "items": {
+                "type": "string",
+                "description": "A tag related to the legislation.",
+            },
+        },
+    },
+}
 
 
 @shared_task(name="legislation.tasks.fetch_and_process_bills_task")
 def fetch_and_process_bills_task():
     """
-    Scheduled task to fetch bills from Congress API and process with Gemini
+    Scheduled task to fetch bills from Congress API and process with Gemini.
+    Only one run fetches at a time; an overlapping scheduled or manual run
+    returns immediately.
     """
+    with redis_lock("bills-run", RUN_LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            logger.info("Another bill fetch run is in progress, skipping")
+            return "Skipped: another run in progress"
+        return run_bill_fetch()
+
+
+@shared_task(name="legislation.tasks.backfill_legislation")
+def backfill_legislation():
+    """
+    Scheduled listing backfill. Refreshes the current congress's law
+    numbers, which the 15-minute bill fetch never sees, and stores the
+    listings of the newest past congress not yet backfilled, one congress
+    per run.
+    """
+    with redis_lock("legislation-backfill", BACKFILL_LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            logger.info("Another legislation backfill is in progress, skipping")
+            return "Skipped: another run in progress"
+
+        current = Congress.get_current_congress_number()
+        if current:
+            call_command("sync_legislation", congress=current, laws=True)
+        past = Congress.objects.filter(bills_synced_at__isnull=True)
+        if current:
+            past = past.filter(congress_number__lt=current)
+        congress = past.order_by("-congress_number").first()
+        if congress is None:
+            return "Legislation backfill complete"
+        call_command("sync_legislation", congress=congress.congress_number, backfill=True)
+        return f"Backfilled congress {congress.congress_number}"
+
+
+def run_bill_fetch():
     try:
         logger.info("Starting scheduled bill fetch and processing task")
         bills = fetch_bills_from_api()
         logger.info(f"Fetched {len(bills)} bills from Congress API")
 
         if bills:
-            process_bills_with_gemini.delay(bills)
-            return f"Queued {len(bills)} bills for processing"
+            keys = queue_bills(bills)
+            return f"Queued {len(keys)} bills for processing"
         else:
             logger.warning("No bills data retrieved from API")
             return "No bills data retrieved"
@@ -43,13 +101,8 @@ def fetch_and_process_bills_task():
 
 
 def fetch_bills_from_api():
-    """Fetch bills modified in the last 4 hours from Congress API"""
-    API_KEY = os.getenv("CONGRESS_API_KEY")
-    BASE_URL = "https://api.congress.gov/v3"
-
+    """Fetch bills modified in the last 15 minutes from Congress API"""
     bills = []
-    offset = 0
-    limit = 250
 
     now = datetime.now()
     then = now - timedelta(minutes=15)
@@ -57,84 +110,153 @@ def fetch_bills_from_api():
     to_datetime = now.strftime("%Y-%m-%dT%H:%M:%SZ")
     from_datetime = then.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    from_datetime_encoded = urllib.parse.quote(from_datetime)
-    to_datetime_encoded = urllib.parse.quote(to_datetime)
+    logger.info(f"Fetching bills from {from_datetime} to {to_datetime}")
+    try:
+        for page in get_client().iter_pages(
+            "bill/119",
+            "bills",
+            params={"fromDateTime": from_datetime, "toDateTime": to_datetime},
+        ):
+            if not page.items:
+                logger.info("No bills found in this time range")
+                break
+            bills.extend(page.items)
+            logger.info(f"Fetched {len(page.items)} bills (total: {len(bills)})")
+    except CongressApiError as e:
+        logger.error(f"Error fetching data: {e.status_code}")
+
+    logger.info("Finished fetching bills")
+    return bills
 
-    while True:
-        url = f"{BASE_URL}/bill/119?format=json&fromDateTime={from_datetime_encoded}&toDateTime={to_datetime_encoded}&api_key={API_KEY}&offset={offset}&limit={limit}"
 
-        logger.info(f"Fetching bills from {from_datetime} to {to_datetime}")
-        response = requests.get(url)
+def bill_key(bill):
+    """The ``(congress, type, number)`` key a bill task carries."""
+    return (int(bill.get("congress")), bill.get("type").lower(), str(bill.get("number")))
 
-        if response.status_code != 200:
-            logger.error(f"Error fetching data: {response.status_code}")
-            break
 
-        data = response.json()
-        pagination_info = data.get("pagination", {})
-        next_page = pagination_info.get("next")
+def queue_bills(bills):
+    """Fans bills out as one small ``process_bill`` task each, so workers
+    process them in parallel and one slow PDF only delays its own bill."""
+    keys = list(dict.fromkeys(bill_key(bill) for bill in bills))
+    group(process_bill.s(*key) for key in keys).apply_async()
+    return keys
 
-        if "bills" in data and data["bills"]:
-            bills.extend(data["bills"])
-            logger.info(f"Fetched {len(data['bills'])} bills (total: {len(bills)})")
-        else:
-            logger.info("No bills found in this time range")
-            break
 
-        if next_page:
-            offset += limit
-        else:
-            logger.info("Finished fetching bills")
-            break
+@shared_task(
+    bind=True,
+    name="legislation.tasks.process_bill",
+    max_retries=3,
+    default_retry_delay=60,
+    acks_late=True,
+)
+def process_bill(self, congress_number, bill_type, number):
+    """Fetch one bill by key, store its detail graph and process it with
+    Gemini.
 
-    return bills
+    Holds a per-bill lock so retries and overlapping runs never work on
+    the same bill at the same time. Gemini 429s and Congress.gov errors are
+    retried; once the daily Gemini budget is spent the bill is parked until
+    ``drain_deferred_bills`` re-queues it after the reset.
+    """
+    with redis_lock(f"bill:{congress_number}:{bill_type}:{number}", BILL_LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            logger.info(f"Bill {bill_type}{number} ({congress_number}) already being processed")
+            return "skipped"
+
+        from .detail import fetch_bill_detail, sync_bill_detail
+
+        try:
+            bill = fetch_bill_detail(congress_number, bill_type, number)
+            sync_bill_detail(bill)
+        except CongressApiError as e:
+            raise self.retry(exc=e)
+
+        try:
+            return process_single_bill_with_gemini(bill)
+        except BudgetExhausted:
+            # A countdown of up to a day would outlive the broker's visibility
+            # timeout and be redelivered early, so park the key instead.
+            logger.warning(f"Gemini daily budget spent, deferring bill {bill_type}{number}")
+            get_redis().sadd(DEFERRED_BILLS_KEY, f"{congress_number}:{bill_type}:{number}")
+            return "deferred"
+        except SummaryInProgress as e:
+            # Another worker holds the summary lock for up to its timeout;
+            # waiting for it is not a failure, so it spends no retries.
+            process_bill.apply_async(
+                args=(congress_number, bill_type, number), countdown=e.retry_after
+            )
+            return "waiting"
+        except RateLimitExceeded as e:
+            raise self.retry(exc=e, countdown=getattr(e, "retry_after", RATE_LIMIT_RETRY_AFTER))
+
+
+@shared_task(name="legislation.tasks.drain_deferred_bills")
+def drain_deferred_bills():
+    """Scheduled task that re-queues bills deferred by a spent Gemini
+    budget, no more than the budget has left today."""
+    remaining = get_daily_budget("gemini").remaining()
+    if not remaining:
+        return "Gemini budget spent, nothing queued"
+    keys = []
+    for raw in get_redis().spop(DEFERRED_BILLS_KEY, remaining) or []:
+        congress_number, bill_type, number = raw.decode().split(":")
+        keys.append((int(congress_number), bill_type, number))
+    if keys:
+        group(process_bill.s(*key) for key in keys).apply_async()
+    logger.info(f"Re-queued {len(keys)} deferred bills")
+    return f"Queued {len(keys)} deferred bills"
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def process_bills_with_gemini(self, bills):
-    """Process bills with Gemini with proper rate limiting"""
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    client = genai.Client(api_key=GEMINI_API_KEY)
-
+    """Kept so messages queued before the per-bill fan-out still drain."""
     if not bills:
         logger.warning("No bills to process")
         return 0
+    return len(queue_bills(bills))
 
-    processed_count = 0
-    last_request_time = time.time()
 
-    for bill in bills:
-        try:
-            # Rate limiting: wait at least 4 seconds between requests (15/min max)
-            current_time = time.time()
-            time_since_last = current_time - last_request_time
-            if time_since_last < 4:
-                sleep_time = 4 - time_since_last
-                logger.info(f"Rate limiting: sleeping {sleep_time:.1f} seconds")
-                time.sleep(sleep_time)
-
-            result = process_single_bill_with_gemini(bill, client)
-            last_request_time = time.time()
-
-            if result:
-                processed_count += 1
-
-        except Exception as e:
-            if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
-                logger.warning(f"Rate limit hit, waiting 60 seconds...")
-                time.sleep(60)
-                # Retry this bill
-                try:
-                    result = process_single_bill_with_gemini(bill, client)
-                    if result:
-                        processed_count += 1
-                except Exception as retry_e:
-                    logger.error(f"Retry failed for bill: {retry_e}")
-            else:
-                logger.error(f"Error processing bill: {e}")
-            continue
-
-    return processed_count
+def get_congress(congress_number):
+    try:
+        return Congress.objects.get(congress_number=congress_number)
+    except Congress.DoesNotExist:
+        logger.info(f"Created new Congress instance for congress {congress_number}")
+        return Congress.objects.create(congress_number=congress_number)
+
+
+def bill_defaults(bill, congress_id):
+    """Listing fields of a Congress.gov bill (list item or detail) as
+    Bills column values."""
+    bill_type = bill.get("type").lower()
+    number = bill.get("number")
+    latest_action = bill.get("latestAction") or {}
+    law = (bill.get("laws") or [{}])[0]
+    return {
+        "number": number,
+        "type": bill_type,
+        "congress_id": congress_id,
+        "latest_action_date": latest_action.get("actionDate"),
+        "latest_action": (latest_action.get("text") or "")[:100] or None,
+        "title": bill.get("title"),
+        "originChamber": bill.get("originChamber"),
+        "url": f"api.congress.gov/v3/bill/{bill.get('congress')}/{bill_type}/{number}",
+        "law_number": law.get("number"),
+        "law_type": law.get("type"),
+    }
+
+
+def save_bill_metadata(bill):
+    """Upserts a bill's listing fields without touching its text or summary."""
+    congress_instance = get_congress(bill.get("congress"))
+    defaults = bill_defaults(bill, congress_instance.id)
+    bill_obj, created = Bills.objects.update_or_create(
+        number=defaults["number"],
+        type=defaults["type"],
+        congress_id=congress_instance.id,
+        defaults=defaults,
+    )
+    notify_changed(bills=[bill_key(bill)])
+    return created
 
 
 def process_single_bill_with_gemini(bill, client=None):
@@ -145,41 +267,15 @@ def process_single_bill_with_gemini(bill, client=None):
 
     try:
         if not client:
-            GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-            client = genai.Client(api_key=GEMINI_API_KEY)
-
-        API_KEY = os.getenv("CONGRESS_API_KEY")
-        BASE_URL = "https://api.congress.gov/v3"
+            client = get_gemini_client()
 
         # Extract bill information
         congress_number = bill.get("congress")
-        title = bill.get("title")
-        originChamber = bill.get("originChamber")
         number = bill.get("number")
         bill_type = bill.get("type").lower()
-        latest_action_date = (
-            bill.get("latestAction").get("actionDate")
-            if bill.get("latestAction")
-            else None
-        )
-        url = f"api.congress.gov/v3/bill/{congress_number}/{bill_type}/{number}"
 
-        # Get or create the Congress instance
-        try:
-            congress_instance = Congress.objects.get(congress_number=congress_number)
-        except Congress.DoesNotExist:
-            congress_instance = Congress.objects.create(congress_number=congress_number)
-            logger.info(f"Created new Congress instance for congress {congress_number}")
-            
-        defaults = {
-            "number": number,
-            "type": bill_type,
-            "congress_id": congress_instance.id,
-            "latest_action_date": latest_action_date,
-            "title": title,
-            "originChamber": originChamber,
-            "url": url,
-        }
+        congress_instance = get_congress(congress_number)
+        defaults = bill_defaults(bill, congress_instance.id)
 
         # Check for existing bill
         existing_bill = None
@@ -193,8 +289,9 @@ def process_single_bill_with_gemini(bill, client=None):
             logger.info(f"New bill {number} - will process with Gemini")
 
         # Use congress_number for API calls
-        text_versions_url = f"{BASE_URL}/bill/{congress_number}/{bill_type}/{number}/text?api_key={API_KEY}&format=json"
-        text_versions_response = requests.get(text_versions_url)
+        text_versions_response = get_client().request(
+            f"bill/{congress_number}/{bill_type}/{number}/text"
+        )
 
         process_with_gemini = False
 
@@ -240,43 +337,18 @@ def process_single_bill_with_gemini(bill, client=None):
                                 f"Processing Bill: {number} of Congress {congress_number}"
                             )
 
-                            doc_data = httpx.get(current_text_url).content
-                            prompt = "Summarize this bill in high school level language, provide key changes and provisions. Also provide 3 tags under 25 characters each"
-
-                            response = client.models.generate_content(
-                                model=GEMINI_MODEL,
-                                contents=[
-                                    types.Part.from_bytes(
-                                        data=doc_data, mime_type="application/pdf"
-                                    ),
-                                    prompt,
-                                ],
-                                config={
-                                    "response_mime_type": "application/json",
-                                    "response_schema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "summary": {
-                                                "type": "string",
-                                                "description": "A short summary of the legislation.",
-                                            },
-                                            "tags": {
-                                                "type": "array",
-                                                "items": {
-                                                    "type": "string",
-                                                    "description": "A tag related to the legislation.",
-                                                },
-                                            },
-                                        },
-                                    },
-                                },
+                            data = summarize_pdf(
+                                current_text_url,
+                                BILL_SUMMARY_PROMPT,
+                                BILL_SUMMARY_SCHEMA,
+                                GEMINI_MODEL,
+                                client=client,
                             )
-
-                            # Process Gemini response
-                            data = json.loads(response.text)
                             defaults["gemini_summary"] = data.get("summary")
                             defaults["tags"] = data.get("tags", [])
 
+                        except RateLimitExceeded:
+                            raise
                         except Exception as e:
                             logger.error(
                                 f"Error with Gemini processing for bill {number}: {e}"
@@ -290,11 +362,14 @@ def process_single_bill_with_gemini(bill, client=None):
             defaults=defaults,
         )
 
+        notify_changed(bills=[(congress_number, bill_type, number)])
         action = "created" if created else "updated"
         gemini_status = "with Gemini" if process_with_gemini else "metadata only"
         logger.info(f"Successfully {action} bill {number} ({gemini_status})")
         return True
 
+    except RateLimitExceeded:
+        raise
     except Exception as e:
         logger.error(
             f"Unexpected error processing bill {number} from congress {congress_number}: {e}"
@@ -3,40 +3,46 @@ from django.shortcuts import render
 from django.views import View
 from django.http import HttpResponse
 from django.views.decorators.http import require_http_methods
-import requests
-import os
-from dotenv import load_dotenv
-from congress.models import Congress, Member
-from legislation.models import Bills
-from django.views.decorators.cache import cache_page
-from django.core.cache import cache
-
-import math
-
-load_dotenv()
-API_KEY = os.getenv("CONGRESS_API_KEY")
-BASE_URL = "https://api.congress.gov/v3"
-CACHE_TIMEOUT = 60 * 15
-CONGRESS_REAL_COUNTS = {}
-
-
-class SimplePagination:
-    def __init__(self, current_page, total_pages, total_count):
-        self.number = current_page
-        self.num_pages = total_pages
-        self.count = total_count
-
-    def has_previous(self):
-        return self.number > 1
-
-    def has_next(self):
-        return self.number < self.num_pages
-
-    def previous_page_number(self):
-        return self.number - 1 if self.has_previous() else None
-
-    def next_page_number(self):
-        return self.number + 1 if self.has_next() else None
+from congress.models import Congress
+from legislation.detail import BillDetailsPending
+from legislation.models import Bills, BillSponsorship
+from legislation.tasks import process_bill
+from core.congress_api import CongressApiError
+from django.db.models import F, Prefetch
+from core.cache_keys import make_key
+from core.invalidation import bill_namespace, legislation_namespace
+from core.pagination import approximate_count, canonical_cursor, keyset_page
+from core.swr import get_or_refresh
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Listings and bill modals are evicted by ingestion (core.invalidation) and
+# served stale past the soft expiry while one request refreshes them.
+LISTING_FRESH_FOR = 60 * 15
+LISTING_CACHE_TIMEOUT = 60 * 60 * 24
+BILL_DETAILS_FRESH_FOR = 60 * 60 * 24
+BILL_DETAILS_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+# Congress.gov failures are remembered this long before asking again.
+BILL_DETAILS_ERROR_TIMEOUT = 60
+BILL_URL_PATTERN = re.compile(r"/bill/(\d+)/([a-zA-Z]+)/(\d+)")
+PAGE_SIZE = 12
+# Newest activity first; matches bills_listing_idx / laws_listing_idx.
+LISTING_KEYS = (("latest_action_date", True), ("id", True))
+# What a legislation card renders, plus the sort keys.
+LISTING_FIELDS = (
+    "id",
+    "title",
+    "type",
+    "number",
+    "originChamber",
+    "url",
+    "latest_action_date",
+    "law_number",
+    "law_type",
+)
 
 
 class LegislationView(View):
@@ -47,105 +53,54 @@ class LegislationView(View):
     partial_template_name = None
     context_key = None
 
+    def get_queryset(self, congress_id):
+        bills = Bills.objects.filter(congress_id=congress_id)
+        if self.endpoint_type == "law":
+            bills = bills.filter(law_number__isnull=False)
+        return bills.values(*LISTING_FIELDS, congress_number=F("congress__congress_number"))
+
+    def get_page(self, congress_id, cursor):
+        """The cards after ``cursor``, the next cursor and, on the first
+        page, the approximate total."""
+        bills = self.get_queryset(congress_id)
+        page = keyset_page(bills, LISTING_KEYS, cursor, PAGE_SIZE)
+        data = [{**bill, "congress": bill["congress_number"]} for bill in page]
+        total_count = 0 if cursor else approximate_count(bills)
+        return data, page.next_cursor, total_count
+
     def get(self, request):
         congress_id = request.GET.get("congress")
-        page = request.GET.get("page", 1)
-
-        try:
-            page = int(page)
-        except (ValueError, TypeError):
-            page = 1
-
-        limit = 12
-        offset = (page - 1) * limit
-        pagination_cache_key = f"{congress_id}_{self.endpoint_type}"
-        api_cache_key = f"api_data_{congress_id}_{self.endpoint_type}_{page}_{limit}"
-
-        cached_api_data = cache.get(api_cache_key)
-
-        if cached_api_data is not None:
-            response_data = cached_api_data
-            response_status = 200
-        else:
-            url = f"{BASE_URL}/{self.endpoint_type}/{congress_id}?api_key={API_KEY}&limit={limit}&offset={offset}"
-
-            response = requests.get(url)
-            response_status = response.status_code
-
-            if response_status == 200:
-                response_data = response.json()
-                cache.set(api_cache_key, response_data, CACHE_TIMEOUT)
-            else:
-                response_data = {}
-
-        if response_status == 200:
-            api_key = "bills" if self.endpoint_type == "law" else self.context_key
-            data = response_data.get(api_key, [])
-
-            pagination = response_data.get("pagination", {})
-            api_total_count = pagination.get("count", 0)
-
-            if pagination_cache_key in CONGRESS_REAL_COUNTS:
-                real_total_count = CONGRESS_REAL_COUNTS[pagination_cache_key]
-                total_pages = (
-                    math.ceil(real_total_count / limit) if real_total_count > 0 else 1
-                )
-                total_count = real_total_count
-            else:
-                total_count = api_total_count
-                total_pages = math.ceil(total_count / limit) if total_count > 0 else 1
-
-                if len(data) == 0 and page > 1:
-                    real_total_count = (page - 1) * limit
-                    CONGRESS_REAL_COUNTS[pagination_cache_key] = real_total_count
-                    total_count = real_total_count
-                    total_pages = page - 1
-
-            page_obj = SimplePagination(page, total_pages, total_count)
-            page_range = self.get_page_range(page, total_pages)
-
-        else:
-            data = []
-            page_obj = SimplePagination(1, 1, 0)
-            page_range = [1]
+        cursor = request.GET.get("cursor")
+
+        data, next_cursor, total_count = [], None, 0
+        if congress_id and congress_id.isdigit():
+            cursor = canonical_cursor(cursor, len(LISTING_KEYS))
+            data, next_cursor, total_count = get_or_refresh(
+                make_key(
+                    legislation_namespace(congress_id),
+                    kind=self.endpoint_type,
+                    cursor=cursor,
+                ),
+                lambda: self.get_page(congress_id, cursor),
+                LISTING_FRESH_FOR,
+                timeout=LISTING_CACHE_TIMEOUT,
+            )
 
         context = {
             self.context_key: data,
-            "url": f"{BASE_URL}/{self.endpoint_type}/{congress_id}?api_key={API_KEY}&limit={limit}&offset={offset}",
-            "page_obj": page_obj,
-            "page_range": page_range,
+            "items": data,
+            "next_cursor": next_cursor,
+            "total_count": total_count,
             "congress_id": congress_id,
             "request": request,
         }
 
         if request.headers.get("HX-Request"):
-            return render(request, self.partial_template_name, context)
+            # Infinite scroll asks for the rows after a cursor only.
+            template = "legislation/partials/legislation_rows.html" if cursor else self.partial_template_name
+            return render(request, template, context)
         return render(request, self.template_name, context)
 
-    def get_page_range(self, current_page, total_pages, on_each_side=2):
-        """Create a page range similar to Django's get_elided_page_range"""
-        if total_pages <= 7:
-            return list(range(1, total_pages + 1))
-
-        start = max(1, current_page - on_each_side)
-        end = min(total_pages, current_page + on_each_side)
-
-        page_range = list(range(start, end + 1))
-
-        if start > 1:
-            if start > 2:
-                page_range = [1, "…"] + page_range
-            else:
-                page_range = [1] + page_range
-
-        if end < total_pages:
-            if end < total_pages - 1:
-                page_range = page_range + ["…", total_pages]
-            else:
-                page_range = page_range + [total_pages]
-
-        return page_range
-
 
 class BillView(LegislationView):
     endpoint_type = "bill"
@@ -165,52 +120,42 @@ def legislation_landing_page(request):
     congresses = Congress.objects.all()
     context = {
         "congresses": congresses,
+        "current_congress": Congress.get_current_congress_object(),
     }
     return render(request, "legislation/legislation.html", context)
 
 
 @require_http_methods(["GET"])
-@cache_page(CACHE_TIMEOUT)
 def bill_details_htmx(request):
-    """HTMX endpoint to fetch and render detailed bill information"""
-    api_url = request.GET.get("url")
-
-    if api_url:
-        separator = "&" if "?" in api_url else "?"
-        api_url_with_key = f"{api_url}{separator}api_key={API_KEY}"
-    else:
-        api_url_with_key = None
-    
+    """HTMX endpoint to render detailed bill information.
+
+    Only the bill key is taken from ``url``; the modal renders from the
+    locally stored bill graph (see legislation.detail). Rendered modals are
+    cached per bill until ingestion next writes that bill (see
+    core.invalidation); Congress.gov errors and bills whose details are
+    still being fetched are cached briefly.
+    """
+    match = BILL_URL_PATTERN.search(request.GET.get("url") or "")
     try:
-        response = requests.get(api_url_with_key, timeout=10)
-        response.raise_for_status()
-        bill_data = response.json().get("bill", {})
-        
-        try:
-            db_bill = Bills.objects.get(
-                type=bill_data.get("type").lower(),
-                number=bill_data.get("number"),
-                congress_id=bill_data.get("congress"),
-            )
-            print(db_bill)
-        except Bills.DoesNotExist:
-            db_bill = None
-            print("Bill not found in local DB")
-
-        if "sponsors" in bill_data:
-            for sponsor in bill_data["sponsors"]:
-                try:
-                    member = Member.objects.get(bioguide_id=sponsor["bioguideId"])
-                    sponsor["member_pk"] = member.pk
-                    sponsor["has_detail_page"] = True
-                except Member.DoesNotExist:
-                    sponsor["member_pk"] = None
-                    sponsor["has_detail_page"] = False
-        return render(
-            request, "legislation/partials/bill_details_modal.html", 
-            {"bill": bill_data, "db_bill": db_bill}
+        if match is None:
+            raise CongressApiError("No bill URL provided")
+        content = get_or_refresh(
+            make_key(bill_namespace(*match.groups()), view="details"),
+            lambda: render_bill_details(request, *match.groups()).content,
+            BILL_DETAILS_FRESH_FOR,
+            timeout=BILL_DETAILS_CACHE_TIMEOUT,
+            errors=(CongressApiError, BillDetailsPending),
+            error_timeout=BILL_DETAILS_ERROR_TIMEOUT,
         )
-    except requests.RequestException as e:
+    except BillDetailsPending:
+        return HttpResponse(
+            """
+            <div class="alert alert-info">
+                <span>Bill details are not available yet. Please check back shortly.</span>
+            </div>
+            """
+        )
+    except CongressApiError as e:
         return HttpResponse(
             f"""
             <div class="alert alert-error">
@@ -218,6 +163,45 @@ def bill_details_htmx(request):
             </div>
             """
         )
+    return HttpResponse(content)
+
+
+def bill_detail_queryset():
+    """Bills with everything the modal renders, in one query per relation."""
+    sponsorships = BillSponsorship.objects.order_by("-is_original_cosponsor", "sponsorship_date", "full_name")
+    return Bills.objects.select_related("congress").defer("search_vector").prefetch_related(
+        Prefetch(
+            "sponsorships",
+            queryset=sponsorships.filter(role=BillSponsorship.SPONSOR),
+            to_attr="sponsor_list",
+        ),
+        Prefetch(
+            "sponsorships",
+            queryset=sponsorships.filter(role=BillSponsorship.COSPONSOR, withdrawn_date__isnull=True),
+            to_attr="cosponsor_list",
+        ),
+        "actions",
+        "amendments",
+        "laws",
+    )
+
+
+def render_bill_details(request, congress_number, bill_type, number):
+    """Renders a stored bill; raises BillDetailsPending if its details have
+    not been synced, after queueing the sync for bills we know of."""
+    bill = bill_detail_queryset().filter(
+        congress__congress_number=congress_number, type=bill_type.lower(), number=number
+    ).first()
+    if bill is None:
+        raise BillDetailsPending
+    if bill.detail_synced_at is None:
+        # Never call Congress.gov from a request; a worker stores it instead.
+        try:
+            process_bill.delay(int(congress_number), bill_type.lower(), number)
+        except Exception:
+            logger.exception(f"Could not queue bill {bill_type}{number} ({congress_number})")
+        raise BillDetailsPending
+    return render(request, "legislation/partials/bill_details_modal.html", {"bill": bill})
 
 
 im_just_a_bill = BillView.as_view()